@@ -2,18 +2,36 @@ from .BaseController import BaseController
 from fastapi import UploadFile
 from models import ResponseSignal
 from .ProjectController import ProjectController
+import asyncio
+import hashlib
+import json
 import re
 import os
+import time
 class DataController(BaseController):
+    # running SHA-256 of resumable uploads, advanced while parts arrive in order;
+    # per worker, a part handled elsewhere just leaves more to hash at the end
+    upload_hashers = {}
+    # queue this worker's requests for a session before they take a database
+    # connection for the cross-worker lock (AssetModel.lock_upload_session)
+    upload_locks = {}
+
     def __init__(self):
         super().__init__()
         self.size_scale = 1048576  # 1 MB
 
     def validate_uploaded_file(self, file: UploadFile):
-        if file.content_type not in self.app_settings.FILE_ALLOWED_TYPES:
+        return self.validate_file_properties(
+            content_type=file.content_type,
+            file_size=file.size,
+            max_size=self.app_settings.FILE_MAX_SIZE,
+        )
+
+    def validate_file_properties(self, content_type: str, file_size: int, max_size: int):
+        if content_type not in self.app_settings.FILE_ALLOWED_TYPES:
             return False, ResponseSignal.FILE_TYPE_NOT_SUPPORTED.value
 
-        if file.size > self.app_settings.FILE_MAX_SIZE * self.size_scale:
+        if file_size > max_size * self.size_scale:
             return False, ResponseSignal.FILE_SIZE_EXCEEDED.value
         return True, ResponseSignal.FILE_VALIDATION_SUCCESS.value
 
@@ -37,4 +55,134 @@ class DataController(BaseController):
 
     def get_clean_file_name(self, orig_file_name: str) -> str:
         cleaned_file_name = re.sub(r'[^\w.]','',orig_file_name.strip())
-        return cleaned_file_name
\ No newline at end of file
+        return cleaned_file_name
+
+    def get_upload_state_path(self, project_id: str, upload_id: str) -> str:
+        project_path = ProjectController().get_project_path(project_id)
+        return os.path.join(project_path, f".{upload_id}.upload.json")
+
+    def get_upload_lock(self, upload_id: str) -> asyncio.Lock:
+        """Local lock of an upload; only call it for a session that was loaded."""
+        return self.upload_locks.setdefault(upload_id, asyncio.Lock())
+
+    def is_upload_session_expired(self, state_path: str) -> bool:
+        # every received part rewrites the state, so this is time since last activity
+        ttl_seconds = self.app_settings.UPLOAD_SESSION_TTL_HOURS * 3600
+        return time.time() - os.path.getmtime(state_path) > ttl_seconds
+
+    def delete_expired_upload_sessions(self, project_id: str) -> int:
+        """Remove abandoned sessions of a project along with their partial files."""
+        project_path = ProjectController().get_project_path(project_id)
+
+        deleted = 0
+        for file_name in os.listdir(project_path):
+            if not (file_name.startswith(".") and file_name.endswith(".upload.json")):
+                continue
+            state_path = os.path.join(project_path, file_name)
+            try:
+                if not self.is_upload_session_expired(state_path):
+                    continue
+                with open(state_path, "r") as f:
+                    upload_state = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            if os.path.exists(upload_state["file_path"]):
+                os.remove(upload_state["file_path"])
+            self.delete_upload_session(
+                project_id=project_id, upload_id=upload_state["upload_id"]
+            )
+            deleted += 1
+        return deleted
+
+    def create_upload_session(
+        self, project_id: str, orig_file_name: str, file_size: int, content_type: str
+    ) -> dict:
+        file_path, file_id = self.generate_unique_filepath(
+            orig_file_name=orig_file_name, project_id=project_id
+        )
+
+        # reserve the full size up front so parts can be written at any offset
+        with open(file_path, "wb") as f:
+            f.truncate(file_size)
+
+        upload_state = {
+            "upload_id": file_id,
+            "file_path": file_path,
+            "file_size": file_size,
+            "content_type": content_type,
+            "received_ranges": [],
+            "hashed_offset": 0,
+        }
+        self.save_upload_session(project_id=project_id, upload_state=upload_state)
+        self.upload_hashers[file_id] = hashlib.sha256()
+        return upload_state
+
+    def load_upload_session(self, project_id: str, upload_id: str):
+        if self.get_clean_file_name(upload_id) != upload_id:
+            return None
+
+        state_path = self.get_upload_state_path(project_id, upload_id)
+        try:
+            if self.is_upload_session_expired(state_path):
+                return None
+            with open(state_path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # never created, or completed/expired meanwhile
+            return None
+
+    def save_upload_session(self, project_id: str, upload_state: dict):
+        state_path = self.get_upload_state_path(project_id, upload_state["upload_id"])
+        with open(state_path + ".tmp", "w") as f:
+            json.dump(upload_state, f)
+        os.replace(state_path + ".tmp", state_path)
+
+    def delete_upload_session(self, project_id: str, upload_id: str):
+        state_path = self.get_upload_state_path(project_id, upload_id)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        self.upload_hashers.pop(upload_id, None)
+        self.upload_locks.pop(upload_id, None)
+
+    def add_received_range(self, upload_state: dict, start: int, end: int):
+        ranges = sorted(upload_state["received_ranges"] + [[start, end]])
+
+        merged = []
+        for range_start, range_end in ranges:
+            if merged and range_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], range_end)
+            else:
+                merged.append([range_start, range_end])
+
+        upload_state["received_ranges"] = merged
+        return upload_state
+
+    def is_upload_complete(self, upload_state: dict) -> bool:
+        ranges = upload_state["received_ranges"]
+        return (
+            len(ranges) == 1
+            and ranges[0][0] == 0
+            and ranges[0][1] >= upload_state["file_size"]
+        )
+
+    def get_upload_hasher(self, upload_state: dict, offset: int):
+        """Return the running hasher if a part at offset extends it, else None."""
+        hasher = self.upload_hashers.get(upload_state["upload_id"])
+        if hasher is None or offset != upload_state["hashed_offset"]:
+            return None
+        return hasher
+
+    def finalize_upload_hash(self, upload_state: dict) -> str:
+        """Finish the running hash, reading from disk whatever was not hashed in order."""
+        hasher = self.upload_hashers.get(upload_state["upload_id"])
+        offset = upload_state["hashed_offset"]
+        if hasher is None:
+            # another worker or a restart lost the running state
+            hasher, offset = hashlib.sha256(), 0
+
+        with open(upload_state["file_path"], "rb") as f:
+            f.seek(offset)
+            while chunk := f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                hasher.update(chunk)
+        return hasher.hexdigest()
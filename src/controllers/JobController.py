@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from models.db_schemas import Job
+from models.enums.JobEnum import JobStatusEnum
+from models.JobModel import JobModel
+
+from .BaseController import BaseController
+
+logger = logging.getLogger("uvicorn.error")
+
+FINISHED_JOB_STATUSES = [
+    JobStatusEnum.COMPLETED.value,
+    JobStatusEnum.FAILED.value,
+    JobStatusEnum.CANCELLED.value,
+]
+
+
+class JobCancelled(Exception):
+    """Raised inside a job whose row was cancelled, possibly by another worker."""
+
+
+class JobProgress:
+    """Counters reported by a running job.
+
+    Counters are persisted to the job row at most every flush_interval
+    seconds; each flush also checks whether the job was cancelled (possibly
+    from another worker) and stops it if so. Without a job_model it only
+    counts, so the same code path can run inside a plain HTTP request.
+    """
+
+    def __init__(
+        self, job_model: JobModel = None, job_id: int = None, flush_interval: float = 2.0
+    ):
+        self.job_model = job_model
+        self.job_id = job_id
+        self.flush_interval = flush_interval
+        self.counters = {}
+        self.last_flush = time.monotonic()
+
+    def set_total(self, **totals):
+        for name, value in totals.items():
+            self.counters[f"total_{name}"] = value
+
+    async def update(self, **increments):
+        for name, value in increments.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            await self.flush()
+
+    async def flush(self):
+        self.last_flush = time.monotonic()
+        if self.job_model is None:
+            return
+
+        updated = await self.job_model.update_job(
+            job_id=self.job_id,
+            values={"job_progress": dict(self.counters)},
+            only_statuses=[JobStatusEnum.RUNNING.value],
+        )
+        if updated == 0:
+            # the job is no longer running, i.e. it was cancelled
+            raise JobCancelled(self.job_id)
+
+
+class JobController(BaseController):
+
+    def __init__(self, db_client: object):
+        super().__init__()
+        self.db_client = db_client
+        self.semaphore = asyncio.Semaphore(self.app_settings.JOB_MAX_CONCURRENT)
+        self.tasks = {}
+        # follow-up work scheduled by jobs, run outside any job slot
+        self.deferred_tasks = set()
+
+    async def submit(
+        self,
+        project_id: int,
+        job_type: str,
+        job_fn: Callable[[JobProgress], Awaitable[tuple]],
+    ) -> Job:
+        """Persist a queued job and schedule job_fn(progress) in the background.
+
+        job_fn returns (status_code, content) like the synchronous endpoints;
+        a non-200 status marks the job as failed.
+        """
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        job = await job_model.create_job(
+            job=Job(
+                job_project_id=project_id,
+                job_type=job_type,
+                job_status=JobStatusEnum.QUEUED.value,
+                job_progress={},
+            )
+        )
+
+        task = asyncio.create_task(self.run_job(job_model, job, job_fn))
+        self.tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(job.job_id, None))
+        return job
+
+    async def run_job(self, job_model: JobModel, job: Job, job_fn: Callable):
+        progress = JobProgress(
+            job_model=job_model,
+            job_id=job.job_id,
+            flush_interval=self.app_settings.JOB_PROGRESS_FLUSH_INTERVAL,
+        )
+        try:
+            async with self.semaphore:
+                started = await job_model.update_job(
+                    job_id=job.job_id,
+                    values={
+                        "job_status": JobStatusEnum.RUNNING.value,
+                        "started_at": datetime.now(timezone.utc),
+                    },
+                    only_statuses=[JobStatusEnum.QUEUED.value],
+                )
+                if started == 0:
+                    return
+
+                status_code, content = await job_fn(progress)
+                await progress.flush()
+
+                job_status = (
+                    JobStatusEnum.COMPLETED.value
+                    if status_code == 200
+                    else JobStatusEnum.FAILED.value
+                )
+                await self.finish_job(
+                    job_model, job.job_id, job_status, content, progress
+                )
+
+        except JobCancelled:
+            # the row is already cancelled; this only stops the job
+            logger.info(f"Job {job.job_uuid} cancelled")
+        except asyncio.CancelledError:
+            # cancelled in this worker (cancel endpoint or shutdown)
+            await self.finish_job(
+                job_model, job.job_id, JobStatusEnum.CANCELLED.value, None, progress
+            )
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.job_uuid} failed: {e}")
+            await self.finish_job(
+                job_model,
+                job.job_id,
+                JobStatusEnum.FAILED.value,
+                {"error": str(e)},
+                progress,
+            )
+
+    async def finish_job(
+        self,
+        job_model: JobModel,
+        job_id: int,
+        job_status: str,
+        content: dict,
+        progress: JobProgress,
+    ):
+        values = {
+            "job_status": job_status,
+            "job_progress": dict(progress.counters),
+            "finished_at": datetime.now(timezone.utc),
+        }
+        if content is not None:
+            values["job_result"] = content
+
+        _ = await job_model.update_job(
+            job_id=job_id,
+            values=values,
+            only_statuses=[JobStatusEnum.QUEUED.value, JobStatusEnum.RUNNING.value],
+        )
+
+    async def cancel(self, job: Job) -> bool:
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        cancelled = await job_model.update_job(
+            job_id=job.job_id,
+            values={
+                "job_status": JobStatusEnum.CANCELLED.value,
+                "finished_at": datetime.now(timezone.utc),
+            },
+            only_statuses=[JobStatusEnum.QUEUED.value, JobStatusEnum.RUNNING.value],
+        )
+
+        # jobs owned by another worker stop at their next progress flush
+        task = self.tasks.get(job.job_id)
+        if task:
+            task.cancel()
+
+        return cancelled > 0
+
+    async def fail_interrupted_jobs(self) -> int:
+        """Fail queued/running jobs left behind by a stopped worker.
+
+        Jobs live in the memory of the worker that accepted them, so after a
+        restart nothing resumes them. Any job that has not written its row for
+        JOB_STALE_AFTER_SECONDS is considered orphaned; jobs of live workers
+        keep flushing progress and are left alone (a job still waiting for a
+        slot that long is failed too, and won't start).
+        """
+        job_model = await JobModel.create_instance(db_client=self.db_client)
+        failed = await job_model.fail_stale_jobs(
+            stale_after_seconds=self.app_settings.JOB_STALE_AFTER_SECONDS,
+            only_statuses=[JobStatusEnum.QUEUED.value, JobStatusEnum.RUNNING.value],
+            values={
+                "job_status": JobStatusEnum.FAILED.value,
+                "job_result": {"error": "interrupted by a server restart"},
+                "finished_at": datetime.now(timezone.utc),
+            },
+        )
+        if failed:
+            logger.warning(f"Marked {failed} interrupted jobs as failed")
+        return failed
+
+    def call_later(self, delay_seconds: float, fn: Callable[[], Awaitable]):
+        """Run fn() after delay_seconds without holding a job slot."""
+
+        async def run_later():
+            await asyncio.sleep(delay_seconds)
+            try:
+                await fn()
+            except Exception as e:
+                logger.error(f"Deferred job step failed: {e}")
+
+        task = asyncio.create_task(run_later())
+        self.deferred_tasks.add(task)
+        task.add_done_callback(self.deferred_tasks.discard)
+        return task
+
+    async def shutdown(self):
+        for task in list(self.tasks.values()) + list(self.deferred_tasks):
+            task.cancel()
+        if self.tasks or self.deferred_tasks:
+            await asyncio.gather(
+                *self.tasks.values(), *self.deferred_tasks, return_exceptions=True
+            )
+
+    def get_job_status(self, job: Job) -> dict:
+        progress = dict(job.job_progress or {})
+
+        # throughput and ETA are derived from every counter that has a total
+        elapsed = None
+        if job.started_at:
+            end = job.finished_at or datetime.now(timezone.utc)
+            elapsed = max((end - job.started_at).total_seconds(), 0.0)
+
+        throughput = {}
+        eta_seconds = None
+        for name, value in progress.items():
+            if name.startswith("total_") or not elapsed:
+                continue
+            throughput[f"{name}_per_second"] = round(value / elapsed, 2)
+
+            total = progress.get(f"total_{name}")
+            if total and value and job.job_status == JobStatusEnum.RUNNING.value:
+                remaining = max(total - value, 0) / (value / elapsed)
+                eta_seconds = max(eta_seconds or 0, round(remaining, 1))
+
+        return {
+            "job_id": str(job.job_uuid),
+            "job_type": job.job_type,
+            "job_status": job.job_status,
+            "project_id": job.job_project_id,
+            "progress": progress,
+            "throughput": throughput,
+            "eta_seconds": eta_seconds,
+            "elapsed_seconds": round(elapsed, 1) if elapsed is not None else None,
+            "result": job.job_result,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
@@ -1,5 +1,7 @@
 import json
 import logging
+import re
+import uuid
 from typing import List
 
 from models.db_schemas import DataChunk, Project
@@ -25,19 +27,57 @@ class NLPController(BaseController):
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
 
+    def create_reindex_collection_name(self, project_id: str, embedding_size: int):
+        # a fresh suffix per re-index, so the shadow never collides with the live one
+        return f"collection_{embedding_size}_{project_id}_{uuid.uuid4().hex[:8]}"
+
+    def get_collection_name(self, project: Project):
+        """Name of the project's live collection, as last switched by a re-index."""
+        vector_collection = project.project_vector_collection or {}
+        return vector_collection.get(
+            "collection_name"
+        ) or self.create_collection_name(project_id=project.project_id)
+
+    async def get_project_collection_names(self, project: Project) -> List[str]:
+        """The live collection plus any re-index shadow, or replaced collection
+        waiting to be dropped, that still holds the project's chunks."""
+        name_pattern = re.compile(rf"collection_\d+_{project.project_id}(_[0-9a-f]{{8}})?")
+        collection_names = {
+            collection_name
+            for collection_name in await self.vectordb_client.list_all_collections()
+            if name_pattern.fullmatch(collection_name)
+        }
+        collection_names.add(self.get_collection_name(project=project))
+        return sorted(collection_names)
+
     async def reset_vector_db_collection(self, project: Project):
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        collection_name = self.get_collection_name(project=project)
         return await self.vectordb_client.delete_collection(
             collection_name=collection_name
         )
 
     async def get_vector_db_collection_info(self, project: Project):
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        collection_name = self.get_collection_name(project=project)
         collection_info = await self.vectordb_client.get_collection_info(
             collection_name=collection_name
         )
         return json.loads(json.dumps(collection_info, default=lambda x: x.__dict__))
 
+    async def get_vector_db_search_quality(
+        self,
+        project: Project,
+        sample_size: int = 20,
+        limit: int = 10,
+        search_effort: int = None,
+    ):
+        collection_name = self.get_collection_name(project=project)
+        return await self.vectordb_client.evaluate_search_quality(
+            collection_name=collection_name,
+            sample_size=sample_size,
+            limit=limit,
+            search_effort=search_effort,
+        )
+
     async def index_into_vector_db(
         self,
         project: Project,
@@ -48,13 +88,13 @@ class NLPController(BaseController):
     ):
 
         # step 1: get collection name
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        collection_name = self.get_collection_name(project=project)
 
         # step 2: manage items
         text = [chunk.chunk_text for chunk in chunks]
         metadatas = [chunk.chunk_metadata for chunk in chunks]
 
-        vectors = self.embedding_client.embed_text(
+        vectors = await self.embedding_client.aembed_text(
             text=text, document_type=DocumentTypeEnum.DOCUMENT.value
         )
         # step 3: create collection if not exists
@@ -80,12 +120,13 @@ class NLPController(BaseController):
         project: Project,
         text: str,
         limit: int = 5,
+        search_effort: int = None,
     ):
         # step 1: get collection name
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        collection_name = self.get_collection_name(project=project)
         vector = None
         # step 2: embed the text
-        vector = self.embedding_client.embed_text(
+        vector = await self.embedding_client.aembed_text(
             text=text, document_type=DocumentTypeEnum.QUERY.value
         )
         if not vector or len(vector) == 0:
@@ -99,6 +140,7 @@ class NLPController(BaseController):
             collection_name=collection_name,
             query_vector=vector,
             limit=limit,
+            search_effort=search_effort,
         )
         if not results:
             return False
@@ -149,13 +191,22 @@ class NLPController(BaseController):
         retrieved_docs = []
         seen_doc_ids = set()
 
-        for q in list_of_queries:
+        # embed all queries in one request and search them in one batch
+        collection_name = self.get_collection_name(project=project)
+        query_vectors = await self.embedding_client.aembed_text(
+            text=list_of_queries, document_type=DocumentTypeEnum.QUERY.value
+        )
+        if not query_vectors:
+            self.logger.error("Failed to generate embeddings for the queries.")
+            query_vectors = []
+        results = await self.vectordb_client.search_many_by_vector(
+            collection_name=collection_name,
+            query_vectors=query_vectors,
+            limit=limit,
+        )
+
+        for q, docs in zip(list_of_queries, results):
             self.logger.info(f"Generated Query: {q}")
-            docs = await self.search_vector_db_collection(
-                project=project,
-                text=q,
-                limit=limit,
-            )
             # Deduplicate documents based on their content or ID
             for doc in docs:
                 doc_id = getattr(doc, "id", None) or hash(doc.text[:100])
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Tuple
+
+from models.ChunkModel import ChunkModel
+from models.db_schemas import Asset, DataChunk, Project
+from stores.llm.LLMEnums import DocumentTypeEnum
+from utils.metrics import INGEST_EMBEDDING_BATCH_SIZE, observe_ingest_stage
+
+from .BaseController import BaseController
+
+logger = logging.getLogger("uvicorn.error")
+
+# marks the end of a stage's input queue
+_STOP = object()
+
+
+class PipelineController(BaseController):
+    """Runs ingestion as concurrent stages connected by bounded asyncio queues.
+
+    Each stage pulls batches from its input queue and pushes results to the
+    next one; a full queue blocks the stage before it, so a slow stage
+    throttles the others instead of letting batches pile up in memory.
+    """
+
+    def __init__(self, db_client, vectordb_client, embedding_client):
+        super().__init__()
+        self.db_client = db_client
+        self.vectordb_client = vectordb_client
+        self.embedding_client = embedding_client
+        self.queue_size = self.app_settings.PIPELINE_QUEUE_SIZE
+
+    async def run_stages(
+        self,
+        source: AsyncIterator,
+        stages: List[Tuple[Callable[[object], Awaitable[object]], int]],
+    ):
+        """Feed source through stages given as (async fn, number of workers).
+
+        A stage returning None drops the batch. The first failing stage
+        cancels the whole pipeline and its exception is raised.
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in stages]
+
+        async def close_queue(stage_idx: int):
+            if stage_idx < len(stages):
+                for _ in range(stages[stage_idx][1]):
+                    await queues[stage_idx].put(_STOP)
+
+        async def feed():
+            async for item in source:
+                await queues[0].put(item)
+            await close_queue(0)
+
+        async def work(stage_idx: int, stage_fn: Callable):
+            while True:
+                item = await queues[stage_idx].get()
+                if item is _STOP:
+                    return
+                result = await stage_fn(item)
+                if result is not None and stage_idx + 1 < len(stages):
+                    await queues[stage_idx + 1].put(result)
+
+        async def run_stage(stage_idx: int, stage_fn: Callable, workers: int):
+            await asyncio.gather(*[work(stage_idx, stage_fn) for _ in range(workers)])
+            await close_queue(stage_idx + 1)
+
+        tasks = [asyncio.create_task(feed())] + [
+            asyncio.create_task(run_stage(idx, stage_fn, workers))
+            for idx, (stage_fn, workers) in enumerate(stages)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    async def iterate_in_thread(iterator: Iterator, batch_size: int):
+        """Drain a blocking iterator in batches without blocking the event loop."""
+        iterator = iter(iterator)
+
+        def next_batch():
+            batch = []
+            for item in iterator:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+            return batch
+
+        while batch := await asyncio.to_thread(next_batch):
+            yield batch
+
+    def embed_and_insert_stages(
+        self,
+        collection_name: str,
+        project_id: int,
+        progress=None,
+        mark_indexed: bool = True,
+    ):
+        """Build the embed and vector-insert stages shared by ingestion and indexing.
+
+        Inserted chunks are marked as indexed, so a retried or repeated push
+        only embeds what is still missing. Loads into a collection that is not
+        live yet (a re-index) pass mark_indexed=False.
+        """
+        embedding_provider = self.app_settings.EMBEDDING_BACKEND
+        vectordb_provider = self.app_settings.VECTOR_DB_BACKEND
+
+        async def embed_stage(chunks: List[DataChunk]):
+            INGEST_EMBEDDING_BATCH_SIZE.labels(
+                project=str(project_id), provider=embedding_provider
+            ).observe(len(chunks))
+            started_at = time.monotonic()
+            vectors = await self.embedding_client.aembed_text(
+                text=[chunk.chunk_text for chunk in chunks],
+                document_type=DocumentTypeEnum.DOCUMENT.value,
+            )
+            if not vectors or len(vectors) != len(chunks):
+                raise RuntimeError("Embedding provider returned no vectors")
+            observe_ingest_stage(
+                "embed",
+                project_id=project_id,
+                provider=embedding_provider,
+                started_at=started_at,
+                items=len(chunks),
+            )
+            if progress:
+                await progress.update(chunks_embedded=len(chunks))
+            return chunks, vectors
+
+        async def insert_stage(item):
+            chunks, vectors = item
+            started_at = time.monotonic()
+            is_inserted = await self.vectordb_client.insert_many(
+                collection_name=collection_name,
+                texts=[chunk.chunk_text for chunk in chunks],
+                vectors=vectors,
+                metadata=[chunk.chunk_metadata for chunk in chunks],
+                record_ids=[chunk.chunk_id for chunk in chunks],
+                batch_size=len(chunks),
+            )
+            if not is_inserted:
+                raise RuntimeError(f"Failed to insert vectors into {collection_name}")
+            if mark_indexed:
+                chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+                _ = await chunk_model.mark_chunks_indexed(
+                    chunks_ids=[chunk.chunk_id for chunk in chunks]
+                )
+            observe_ingest_stage(
+                "vector_insert",
+                project_id=project_id,
+                provider=vectordb_provider,
+                started_at=started_at,
+                items=len(chunks),
+            )
+            if progress:
+                await progress.update(chunks_inserted=len(chunks))
+            return None
+
+        return [
+            (embed_stage, self.app_settings.PIPELINE_EMBEDDING_CONCURRENCY),
+            (insert_stage, 1),
+        ]
+
+    async def index_chunks(
+        self,
+        collection_name: str,
+        project_id: int,
+        chunk_pages: AsyncIterator,
+        progress=None,
+        mark_indexed: bool = True,
+    ) -> int:
+        """Embed and insert already stored chunks, reading the next pages while
+        earlier ones are still being embedded; returns the indexed count."""
+        counts = {"chunks": 0}
+
+        async def count_pages():
+            async for chunks in chunk_pages:
+                counts["chunks"] += len(chunks)
+                yield chunks
+
+        await self.run_stages(
+            source=count_pages(),
+            stages=self.embed_and_insert_stages(
+                collection_name=collection_name,
+                project_id=project_id,
+                progress=progress,
+                mark_indexed=mark_indexed,
+            ),
+        )
+        return counts["chunks"]
+
+    async def ingest_file(
+        self,
+        project: Project,
+        asset: Asset,
+        collection_name: str,
+        file_chunks: Iterator,
+        progress=None,
+    ) -> dict:
+        """Split, store, embed and index one file in a single streaming pass."""
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        batch_size = self.app_settings.PIPELINE_EMBEDDING_BATCH_SIZE
+        counts = {"chunks": 0, "inserted_chunks": 0}
+
+        async def persist_stage(documents: list):
+            chunks = [
+                DataChunk(
+                    chunk_text=document.page_content,
+                    chunk_metadata=document.metadata,
+                    chunk_order=counts["chunks"] + i + 1,
+                    chunk_project_id=project.project_id,
+                    chunk_asset_id=asset.asset_id,
+                )
+                for i, document in enumerate(documents)
+            ]
+            counts["chunks"] += len(chunks)
+
+            started_at = time.monotonic()
+            _ = await chunk_model.bulk_insert_chunks(chunks=chunks)
+            observe_ingest_stage(
+                "store",
+                project_id=project.project_id,
+                provider="postgres",
+                started_at=started_at,
+                items=len(chunks),
+            )
+            # duplicates were not stored, so there is nothing to embed for them
+            chunks = [chunk for chunk in chunks if chunk.chunk_id is not None]
+            counts["inserted_chunks"] += len(chunks)
+            if progress:
+                await progress.update(
+                    chunks_processed=len(documents), chunks_stored=len(chunks)
+                )
+            return chunks or None
+
+        stages = [(persist_stage, 1)] + self.embed_and_insert_stages(
+            collection_name=collection_name,
+            project_id=project.project_id,
+            progress=progress,
+        )
+        await self.run_stages(
+            source=self.iterate_in_thread(file_chunks, batch_size=batch_size),
+            stages=stages,
+        )
+        return counts
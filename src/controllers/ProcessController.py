@@ -1,14 +1,17 @@
+import hashlib
 import logging
 import os
+import queue
 
 from langchain_community.document_loaders import PyMuPDFLoader, TextLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_experimental.text_splitter import SemanticChunker
-from models import ProcessingEnum
+from models import ChunkBoundaryEnum, ProcessingEnum, SplitterEnum
+from utils.metrics import TimedIterator
 
 from .BaseController import BaseController
 from .ProjectController import ProjectController
-from typing import List
+from typing import Iterable, Iterator, List
 
 from dataclasses import dataclass
 import re
@@ -18,6 +21,12 @@ class Document:
     metadata: dict
 logger = logging.getLogger("uvicorn.error")
 
+# a worker gives up on a file when the parent stops reading its batches
+WORKER_QUEUE_TIMEOUT = 300
+
+TOKEN_PATTERN = re.compile(r"\n\s*\n|\S+")
+SENTENCE_END_PATTERN = re.compile(r"[.!?][\"')\]]*$")
+
 
 class ProcessController(BaseController):
     def __init__(self, project_id, embedding_client=None):
@@ -44,19 +53,39 @@ class ProcessController(BaseController):
 
         return None
 
+    def get_file_hash(self, file_id: str):
+        file_path = os.path.join(self.project_path, file_id)
+        if not os.path.exists(file_path):
+            logger.error(f"File not found: {file_path}")
+            return None
+
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while chunk := f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
     def get_file_content(self, file_id: str):
         loader = self.get_file_loader(file_id=file_id)
         if loader:
-            return loader.load()
+            # pages are produced lazily so large files are never fully loaded
+            return TimedIterator(
+                loader.lazy_load(),
+                stage="extract",
+                project_id=self.project_id,
+                provider=self.get_file_extension(file_id).lstrip("."),
+            )
         return None
 
     def process_file_content(
         self,
-        file_content: list,
+        file_content: Iterable,
         file_id: str,
         chunk_size: int = 100,
         overlap_size: int = 20,
-    ):
+        splitter: str = SplitterEnum.SIMPLE.value,
+        boundary: str = ChunkBoundaryEnum.NONE.value,
+    ) -> Iterator[Document]:
         # text_splitter = SemanticChunker(
         #     embeddings=self.embedding_client,
         #     min_chunk_size=chunk_size
@@ -64,18 +93,30 @@ class ProcessController(BaseController):
         #     # length_function=len,
         #     # separators=["\n\n", "\n", " ", ""],
         # )
-        file_content_text = [doc.page_content for doc in file_content]
-        file_content_metadata = [doc.metadata for doc in file_content]
         # chunks = text_splitter.create_documents(
         #     file_content_text, metadatas=file_content_metadata
         # )
 
-        chunks = self.process_simpler_splitter(
-            texts=file_content_text,
-            metadatas=file_content_metadata,
-            chunk_size=chunk_size,
-        )   
-        return chunks
+        if splitter == SplitterEnum.SLIDING_WINDOW.value:
+            chunks = self.process_sliding_window_splitter(
+                pages=file_content,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                boundary=boundary,
+            )
+        else:
+            chunks = self.process_streaming_splitter(
+                pages=file_content,
+                chunk_size=chunk_size,
+            )
+
+        return TimedIterator(
+            chunks,
+            stage="chunk",
+            project_id=self.project_id,
+            provider=splitter,
+            inner=file_content if isinstance(file_content, TimedIterator) else None,
+        )
 
     def clean_extracted_text(self,text: str) -> str:
         """Clean text extracted from PDFs"""
@@ -90,30 +131,209 @@ class ProcessController(BaseController):
         text = re.sub(r'\s+', ' ', text).strip()
         
         return text
-    def process_simpler_splitter(self, texts: List[str], metadatas: List[dict], chunk_size: int, splitter_tag: str="\n"):
-        
-        full_text = " ".join(texts)
 
-        # split by splitter_tag
-        lines = [ doc.strip() for doc in full_text.split(splitter_tag) if len(doc.strip()) > 1 ]
+    def get_chunk_metadata(self, start_metadata: dict, end_metadata: dict) -> dict:
+        metadata = dict(start_metadata or {})
+        if (
+            "page" in metadata
+            and end_metadata
+            and end_metadata.get("page") != metadata["page"]
+        ):
+            metadata["end_page"] = end_metadata.get("page")
+        return metadata
+
+    def process_streaming_splitter(
+        self, pages: Iterable, chunk_size: int, splitter_tag: str = "\n"
+    ) -> Iterator[Document]:
+        """Split pages into chunks lazily, holding at most one chunk in memory.
+
+        Pages are consumed one at a time; a line cut by a page break is carried
+        over and joined with the start of the next page.
+        """
+        chunk_lines = []
+        chunk_length = 0
+        chunk_metadata = None
+        last_metadata = None
+
+        pending_line = None
+        pending_metadata = None
+
+        def build_chunk():
+            return Document(
+                page_content=self.clean_extracted_text("".join(chunk_lines).strip()),
+                metadata=self.get_chunk_metadata(chunk_metadata, last_metadata),
+            )
+
+        def page_lines():
+            nonlocal pending_line, pending_metadata
+            for page in pages:
+                lines = page.page_content.split(splitter_tag)
+                first_metadata = page.metadata
+                if pending_line is not None:
+                    lines[0] = pending_line + " " + lines[0]
+                    first_metadata = pending_metadata
+
+                for i, line in enumerate(lines[:-1]):
+                    yield line, first_metadata if i == 0 else page.metadata
+
+                pending_line = lines[-1]
+                pending_metadata = first_metadata if len(lines) == 1 else page.metadata
+
+            if pending_line is not None:
+                yield pending_line, pending_metadata
+
+        for line, metadata in page_lines():
+            line = line.strip()
+            if len(line) <= 1:
+                continue
+
+            if not chunk_lines:
+                chunk_metadata = metadata
+            last_metadata = metadata
 
-        chunks = []
-        current_chunk = ""
+            chunk_lines.append(line + splitter_tag)
+            chunk_length += len(line) + len(splitter_tag)
 
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(
-                    page_content=self.clean_extracted_text(current_chunk.strip()),
-                    metadata={}
-                ))
+            if chunk_length >= chunk_size:
+                yield build_chunk()
+                chunk_lines = []
+                chunk_length = 0
 
-                current_chunk = ""
+        if chunk_lines:
+            yield build_chunk()
 
-        if len(current_chunk) >= 0:
-            chunks.append(Document(
-                page_content=self.clean_extracted_text(current_chunk),
-                metadata={}
-            ))
+    def find_chunk_boundary(self, window: list, min_cut: int, boundary: str) -> int:
+        """Return how many leading tokens of the window to cut as the next chunk.
+
+        Searches backwards for the last paragraph or sentence end, without
+        going below min_cut; falls back to the full window.
+        """
+        if boundary == ChunkBoundaryEnum.NONE.value:
+            return len(window)
+
+        sentence_cut = None
+        for i in range(len(window) - 1, min_cut - 2, -1):
+            _, _, ends_sentence, ends_paragraph = window[i]
+            if ends_paragraph and boundary == ChunkBoundaryEnum.PARAGRAPH.value:
+                return i + 1
+            if ends_sentence and sentence_cut is None:
+                sentence_cut = i + 1
+                if boundary == ChunkBoundaryEnum.SENTENCE.value:
+                    return sentence_cut
+
+        return sentence_cut or len(window)
+
+    def process_sliding_window_splitter(
+        self,
+        pages: Iterable,
+        chunk_size: int,
+        overlap_size: int = 0,
+        boundary: str = ChunkBoundaryEnum.NONE.value,
+    ) -> Iterator[Document]:
+        """Split pages into overlapping windows of chunk_size tokens.
+
+        Tokens are whitespace-separated words. Consecutive chunks share up to
+        overlap_size tokens, and with a boundary set each cut is moved back to
+        the last sentence/paragraph end in the second half of the window. Every
+        token is buffered once, so the pass is linear in the document length.
+        """
+        chunk_size = max(chunk_size, 1)
+        overlap_size = min(max(overlap_size or 0, 0), chunk_size - 1)
+        min_cut = max(chunk_size // 2, 1)
+
+        def page_tokens():
+            for page in pages:
+                for match in TOKEN_PATTERN.finditer(page.page_content):
+                    word = match.group(0)
+                    if word.isspace():
+                        # blank line: the previous token closes a paragraph
+                        if window:
+                            text, metadata, ends_sentence, _ = window[-1]
+                            window[-1] = (text, metadata, ends_sentence, True)
+                        continue
+                    yield (
+                        word,
+                        page.metadata,
+                        SENTENCE_END_PATTERN.search(word) is not None,
+                        False,
+                    )
+
+        def build_chunk(tokens: list):
+            return Document(
+                page_content=self.clean_extracted_text(
+                    " ".join(token[0] for token in tokens)
+                ),
+                metadata=self.get_chunk_metadata(tokens[0][1], tokens[-1][1]),
+            )
+
+        window = []
+        # number of leading tokens in the window already emitted (the overlap)
+        emitted = 0
+
+        for token in page_tokens():
+            window.append(token)
+            if len(window) < chunk_size:
+                continue
+
+            cut = self.find_chunk_boundary(window, min_cut=min_cut, boundary=boundary)
+            yield build_chunk(window[:cut])
+
+            # every chunk advances by at least half its length, even when a
+            # boundary cut lands early and overlap_size is close to chunk_size
+            start = max(cut - overlap_size, (cut + 1) // 2)
+            window = window[start:]
+            emitted = cut - start
+
+        if len(window) > emitted:
+            yield build_chunk(window)
+
+
+def process_file_worker(
+    chunk_queue,
+    project_id,
+    file_id: str,
+    chunk_size: int = 100,
+    overlap_size: int = 20,
+    splitter: str = SplitterEnum.SIMPLE.value,
+    boundary: str = ChunkBoundaryEnum.NONE.value,
+    batch_size: int = 1000,
+):
+    """Load and chunk a single file, meant to run inside a process pool worker.
+
+    Chunks are sent to the parent through chunk_queue in batches of
+    batch_size, followed by None, so neither process holds a whole file's
+    chunks. The queue is bounded: a worker ahead of the inserts waits for
+    them. Returns the number of chunks, or None if the file can't be loaded.
+    """
+    process_controller = ProcessController(project_id=project_id)
+
+    try:
+        file_content = process_controller.get_file_content(file_id=file_id)
+        if file_content is None:
+            return None
+
+        no_chunks = 0
+        batch = []
+        for chunk in process_controller.process_file_content(
+            file_content=file_content,
+            file_id=file_id,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            splitter=splitter,
+            boundary=boundary,
+        ):
+            batch.append(chunk)
+            no_chunks += 1
+            if len(batch) >= batch_size:
+                chunk_queue.put(batch, timeout=WORKER_QUEUE_TIMEOUT)
+                batch = []
 
-        return chunks
+        if batch:
+            chunk_queue.put(batch, timeout=WORKER_QUEUE_TIMEOUT)
+        return no_chunks
+    finally:
+        try:
+            chunk_queue.put(None, timeout=WORKER_QUEUE_TIMEOUT)
+        except queue.Full:
+            # the parent stopped reading, e.g. the job was cancelled
+            pass
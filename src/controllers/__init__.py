@@ -2,4 +2,6 @@ from .BaseController import BaseController
 from .DataController import DataController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
-from .NLPController import NLPController
\ No newline at end of file
+from .NLPController import NLPController
+from .JobController import JobController
+from .PipelineController import PipelineController
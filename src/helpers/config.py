@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Literal
 
 from pydantic_settings import BaseSettings
 
@@ -10,6 +10,19 @@ class Settings(BaseSettings):
     FILE_ALLOWED_TYPES: list[str]
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
+    FILE_RESUMABLE_MAX_SIZE: int = 500  # MB, limit for resumable multi-part uploads
+    FILE_UPLOAD_PART_MAX_SIZE: int = 8  # MB, must stay below nginx client_max_body_size
+    UPLOAD_SESSION_TTL_HOURS: float = 24  # Resumable uploads idle this long are expired and removed
+
+    PROCESS_POOL_MAX_WORKERS: int = 4  # Worker processes for parallel file processing
+
+    JOB_MAX_CONCURRENT: int = 2  # Background processing/indexing jobs running at once
+    JOB_PROGRESS_FLUSH_INTERVAL: float = 2.0  # Seconds between job progress writes
+    JOB_STALE_AFTER_SECONDS: float = 600  # Queued/running jobs not written for this long are failed at startup
+
+    PIPELINE_QUEUE_SIZE: int = 4  # Batches buffered between two pipeline stages
+    PIPELINE_EMBEDDING_BATCH_SIZE: int = 100  # Chunks per embedding request
+    PIPELINE_EMBEDDING_CONCURRENCY: int = 2  # Embedding requests in flight at once
 
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
@@ -29,6 +42,18 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
+    EMBEDDING_ALLOWED_MODELS: dict[str, int] = {}  # Other models a re-index may switch to, with their sizes
+    EMBEDDING_CACHE_ENABLED: bool = True  # Reuse stored embeddings of identical texts
+    EMBEDDING_CACHE_LRU_SIZE: int = 10000  # Embeddings kept in memory per worker
+    EMBEDDING_RPM_LIMIT: int = 0  # Provider requests per minute, 0 = unlimited
+    EMBEDDING_TPM_LIMIT: int = 0  # Provider tokens per minute, 0 = unlimited
+    EMBEDDING_MAX_BATCH_SIZE: int = 100  # Texts per embedding request
+    EMBEDDING_MAX_BATCH_TOKENS: int = 20000  # Estimated tokens per embedding request
+    EMBEDDING_MAX_CONCURRENT_REQUESTS: int = 4  # Embedding requests in flight per worker
+    EMBEDDING_MAX_RETRIES: int = 5  # Retries with backoff for failed embedding requests
+    REINDEX_EMBEDDING_RPM_LIMIT: int = 0  # Requests per minute for background re-index, 0 = unlimited
+    REINDEX_EMBEDDING_TPM_LIMIT: int = 0  # Tokens per minute for background re-index, 0 = unlimited
+    REINDEX_DROP_DELAY_SECONDS: int = 60  # Wait before dropping the old collection after a switch
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
@@ -36,11 +61,37 @@ class Settings(BaseSettings):
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND: str  # Options: "QDRANT"
     VECTOR_DB_PATH: str  # Path for Qdrant DB
+    VECTOR_DB_URL: str = None  # Qdrant server url, e.g. "http://qdrant:6333"; empty = local path
+    VECTOR_DB_API_KEY: str = None
+    VECTOR_DB_QDRANT_PREFER_GRPC: bool = True  # Talk to the Qdrant server over gRPC
+    VECTOR_DB_QDRANT_GRPC_PORT: int = 6334
+    VECTOR_DB_QDRANT_UPLOAD_PARALLELISM: int = 4  # Upsert batches in flight at once
+    VECTOR_DB_QDRANT_QUANTIZATION: Literal["none", "scalar", "product"] = "none"  # Quantization of new collections
+    VECTOR_DB_QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True  # Keep quantized vectors in RAM
+    VECTOR_DB_QDRANT_PQ_COMPRESSION: Literal["x4", "x8", "x16", "x32", "x64"] = "x16"  # Product quantization ratio
+    VECTOR_DB_QDRANT_ON_DISK: bool = False  # Store original vectors on disk (mmap)
+    VECTOR_DB_QDRANT_HNSW_M: int = 16
+    VECTOR_DB_QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    VECTOR_DB_QDRANT_RESCORE: bool = True  # Rescore quantized hits on original vectors
+    VECTOR_DB_QDRANT_OVERSAMPLING: float = 2.0  # Candidates fetched per result before rescoring
     VECTOR_DB_DISTANCE_METHOD: str  # Options: "COSINE", "DOT"
     VECTOR_DB_DISTANCE_METHOD_LITERAL: List[str] = None
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int = (
         100  # Threshold to create index on pgvector vector column
     )
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "1GB"  # Memory for building the vector index
+    VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS: int = 4  # Parallel workers for index builds
+    VECTOR_DB_PGVEC_STORAGE_MODE: str = "vector"  # Options: "vector", "halfvec", "binary"
+    VECTOR_DB_PGVEC_RERANK_FACTOR: int = 4  # Candidates per result reranked in binary mode
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"  # Options: "hnsw", "ivfflat"
+    VECTOR_DB_PGVEC_HNSW_M: int = 16  # Graph connections per node
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64  # Candidate list size while building
+    VECTOR_DB_PGVEC_HNSW_EF_SEARCH: int = 40  # Default candidate list size while searching
+    VECTOR_DB_PGVEC_IVFFLAT_PROBES: int = 10  # Default lists scanned per search
+    VECTOR_DB_PGVEC_IVFFLAT_RECLUSTER_GROWTH: float = 2.0  # Rebuild lists when rows grow by this factor
+    # Options: "table", "partitioned". Partitions share one schema and index definition per
+    # size, but each is still a table with its own index: catalog objects don't shrink
+    VECTOR_DB_PGVEC_LAYOUT: str = "table"
 
     TAVILY_API_KEY: str = None
 
@@ -1,15 +1,23 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from helpers.config import get_settings
-from routes import base_router, data_router, nlp_router
+from controllers import JobController
+from routes import base_router, data_router, jobs_router, nlp_router
+from stores.llm.EmbeddingClientRegistry import EmbeddingClientRegistry
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.llm.templates import TemplateParser
 from stores.vectordb import VectorDBProviderFactory
+from stores.vectordb.providers import PGVectorProvider
+from stores.vectordb.VectorDBEnums import VectorDBEnums
 from utils.metrics import setup_metrics
 
 app = FastAPI()
@@ -41,29 +49,51 @@ async def startup_span():
     settings = get_settings()
     postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
     app.db_engine = create_async_engine(postgres_conn)
+    if settings.VECTOR_DB_BACKEND == VectorDBEnums.PGVECTOR.value:
+        # before anything connects, so every pooled connection gets the codec
+        event.listen(
+            app.db_engine.sync_engine, "connect", PGVectorProvider.register_vector_codec
+        )
     app.db_client = sessionmaker(
         app.db_engine, class_=AsyncSession, expire_on_commit=False
     )
     print("Connected to the PostgreSQL database!")
     llm_provider_factory = LLMProviderFactory(config=settings)
     vector_db_provider_factory = VectorDBProviderFactory(
-        config=settings, db_client=app.db_client
+        config=settings, db_client=app.db_client, db_engine=app.db_engine
     )
 
     # Clients
     app.generation_client = llm_provider_factory.create(settings.GENERATION_BACKEND)
-    app.embedding_client = llm_provider_factory.create(settings.EMBEDDING_BACKEND)
 
     # Set default models
     app.generation_client.set_generation_model(settings.GENERATION_MODEL_ID)
-    app.embedding_client.set_embedding_model(
-        settings.EMBEDDING_MODEL_ID, settings.EMBEDDING_MODEL_SIZE
+
+    # embedding clients per model; projects re-indexed with another model use theirs
+    app.embedding_clients = EmbeddingClientRegistry(
+        config=settings,
+        llm_provider_factory=llm_provider_factory,
+        db_client=app.db_client,
     )
+    app.embedding_client = app.embedding_clients.default
 
     # Vector DB Client
     app.vector_db_client = vector_db_provider_factory.create(settings.VECTOR_DB_BACKEND)
     await app.vector_db_client.connect()
 
+    # Process pool for parallel file processing; spawned, since forking now
+    # would copy the event loop, its threads and the open database sockets
+    mp_context = multiprocessing.get_context("spawn")
+    app.process_pool = ProcessPoolExecutor(
+        max_workers=settings.PROCESS_POOL_MAX_WORKERS, mp_context=mp_context
+    )
+    # bounded queues that stream chunk batches back from the pool workers
+    app.process_manager = mp_context.Manager()
+
+    # Background jobs
+    app.job_controller = JobController(db_client=app.db_client)
+    await app.job_controller.fail_interrupted_jobs()
+
     # Template Parser
     app.template_parser = TemplateParser(
         default_language=settings.DEFAULT_LANG, language=settings.PRIMARY_LANG
@@ -72,9 +102,12 @@ async def startup_span():
 
 @app.on_event("shutdown")
 async def shutdown_span():
+    await app.job_controller.shutdown()
     app.db_engine.dispose()
     print("Disconnected from the PostgreSQL database!")
     await app.vector_db_client.disconnect()
+    app.process_pool.shutdown(wait=False, cancel_futures=True)
+    app.process_manager.shutdown()
 
 
 # app.router.lifespan.on_startup.append(startup_span)
@@ -83,3 +116,4 @@ async def shutdown_span():
 app.include_router(base_router)
 app.include_router(data_router)
 app.include_router(nlp_router)
+app.include_router(jobs_router)
@@ -3,6 +3,8 @@ from .db_schemas import Asset
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId
 from sqlalchemy.future import select
+from sqlalchemy import update, text as sql_text
+from contextlib import asynccontextmanager
 
 class AssetModel(BaseDataModel):
 
@@ -46,5 +48,39 @@ class AssetModel(BaseDataModel):
             record = result.scalar_one_or_none()
         return record
 
+    async def update_asset_record(self, asset_id: int, values: dict):
 
-    
\ No newline at end of file
+        async with self.db_client() as session:
+            stmt = update(Asset).where(Asset.asset_id == asset_id).values(**values)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def reset_project_assets_processing(self, asset_project_id: int):
+        """Forget which fingerprint/parameters every project asset was processed with."""
+
+        async with self.db_client() as session:
+            stmt = (
+                update(Asset)
+                .where(Asset.asset_project_id == asset_project_id)
+                .values(asset_config=Asset.asset_config.op("-")("processed"))
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    @asynccontextmanager
+    async def lock_upload_session(self, upload_id: str):
+        """Serialize work on a resumable upload across workers.
+
+        Sessions live on the shared files volume, so any uvicorn worker may
+        receive a part; a transaction-level advisory lock makes their
+        read-modify-write of the session state exclusive.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    sql_text("SELECT pg_advisory_xact_lock(hashtext(:lock_key))"),
+                    {"lock_key": f"upload:{upload_id}"},
+                )
+                yield
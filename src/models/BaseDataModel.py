@@ -3,4 +3,11 @@ from helpers.config import Settings, get_settings
 class BaseDataModel:
     def __init__(self, db_client:object):
         self.settings = get_settings()
-        self.db_client = db_client
\ No newline at end of file
+        self.db_client = db_client
+
+    @staticmethod
+    async def get_driver_connection(session):
+        """Return the asyncpg connection behind a session, for COPY and other bulk calls."""
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
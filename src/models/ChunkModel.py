@@ -4,7 +4,11 @@ from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne
 from sqlalchemy.future import select
-from sqlalchemy import func, delete
+from sqlalchemy import func, delete, update, case
+from sqlalchemy.sql import text as sql_text
+import hashlib
+import json
+import uuid
 
 class ChunkModel(BaseDataModel):
 
@@ -33,15 +37,158 @@ class ChunkModel(BaseDataModel):
             chunk = result.scalar_one_or_none()
         return chunk
 
-    async def insert_many_chunks(self, chunks: list, batch_size: int=100):
+    @staticmethod
+    def get_chunk_hash(chunk_text: str) -> str:
+        # normalize case and whitespace so trivially different copies collide
+        normalized_text = " ".join(chunk_text.lower().split())
+        return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+    async def insert_many_chunks(self, chunks: list, skip_duplicates: bool = True):
+        chunks_ids = await self.bulk_insert_chunks(
+            chunks=chunks, skip_duplicates=skip_duplicates
+        )
+        return len(chunks_ids)
+
+    async def bulk_insert_chunks(self, chunks: list, skip_duplicates: bool = True):
+        """Bulk-load chunks with COPY and return the generated chunk ids.
+
+        Rows are copied in the binary protocol into a per-connection staging
+        table and moved into chunks by a single INSERT ... SELECT, so no ORM
+        objects are flushed. With skip_duplicates, chunks whose hash already
+        exists in the project (or earlier in the same call) are not inserted;
+        the partial unique index on (chunk_project_id, chunk_hash) makes this
+        hold for concurrent calls too. Without it every chunk is inserted and
+        the copies keep a NULL hash. Inserted chunks get their chunk_id set;
+        skipped ones keep None.
+        """
+        if not chunks:
+            return []
+
+        for chunk in chunks:
+            if chunk.chunk_hash is None:
+                chunk.chunk_hash = self.get_chunk_hash(chunk.chunk_text)
+            # generated here so the RETURNING rows can be mapped back to chunks
+            if chunk.chunk_uuid is None:
+                chunk.chunk_uuid = uuid.uuid4()
+
+        records = [
+            (
+                chunk.chunk_uuid,
+                chunk.chunk_text,
+                json.dumps(chunk.chunk_metadata or {}, ensure_ascii=False),
+                chunk.chunk_order,
+                chunk.chunk_project_id,
+                chunk.chunk_asset_id,
+                chunk.chunk_hash,
+                row_no,
+            )
+            for row_no, chunk in enumerate(chunks)
+        ]
+
+        if skip_duplicates:
+            select_staging_sql = """
+                SELECT DISTINCT ON (chunk_project_id, chunk_hash) *
+                FROM chunks_staging
+                ORDER BY chunk_project_id, chunk_hash, row_no
+            """
+            on_conflict_sql = (
+                "ON CONFLICT (chunk_project_id, chunk_hash) "
+                "WHERE chunk_hash IS NOT NULL DO NOTHING"
+            )
+        else:
+            # only the first copy of a hash may hold it under the unique index
+            select_staging_sql = """
+                SELECT
+                    s.chunk_uuid, s.chunk_text, s.chunk_metadata, s.chunk_order,
+                    s.chunk_project_id, s.chunk_asset_id, s.row_no,
+                    CASE WHEN row_number() OVER (
+                        PARTITION BY s.chunk_project_id, s.chunk_hash ORDER BY s.row_no
+                    ) = 1 AND NOT EXISTS (
+                        SELECT 1 FROM chunks c
+                        WHERE c.chunk_project_id = s.chunk_project_id
+                        AND c.chunk_hash = s.chunk_hash
+                    ) THEN s.chunk_hash END AS chunk_hash
+                FROM chunks_staging s
+            """
+            on_conflict_sql = ""
 
         async with self.db_client() as session:
             async with session.begin():
-                for i in range(0, len(chunks), batch_size):
-                    batch = chunks[i:i+batch_size]
-                    session.add_all(batch)
-            await session.commit()
-        return len(chunks)
+                await session.execute(sql_text(
+                    """
+                    CREATE TEMP TABLE IF NOT EXISTS chunks_staging (
+                        chunk_uuid uuid,
+                        chunk_text text,
+                        chunk_metadata jsonb,
+                        chunk_order integer,
+                        chunk_project_id integer,
+                        chunk_asset_id integer,
+                        chunk_hash varchar(64),
+                        row_no integer
+                    ) ON COMMIT DELETE ROWS
+                    """
+                ))
+
+                connection = await self.get_driver_connection(session)
+                await connection.copy_records_to_table(
+                    "chunks_staging",
+                    records=records,
+                    columns=[
+                        "chunk_uuid",
+                        "chunk_text",
+                        "chunk_metadata",
+                        "chunk_order",
+                        "chunk_project_id",
+                        "chunk_asset_id",
+                        "chunk_hash",
+                        "row_no",
+                    ],
+                )
+
+                result = await session.execute(sql_text(
+                    f"""
+                    INSERT INTO chunks (
+                        chunk_uuid, chunk_text, chunk_metadata, chunk_order,
+                        chunk_project_id, chunk_asset_id, chunk_hash
+                    )
+                    SELECT
+                        s.chunk_uuid, s.chunk_text, s.chunk_metadata, s.chunk_order,
+                        s.chunk_project_id, s.chunk_asset_id, s.chunk_hash
+                    FROM ({select_staging_sql}) s
+                    ORDER BY s.row_no
+                    {on_conflict_sql}
+                    RETURNING chunk_id, chunk_uuid
+                    """
+                ))
+                # RETURNING order is not guaranteed, so map through chunk_uuid
+                inserted_ids = {
+                    str(record.chunk_uuid): record.chunk_id
+                    for record in result.fetchall()
+                }
+
+                if skip_duplicates:
+                    # the stored copy now also stands for these assets' text,
+                    # see release_asset_chunks
+                    await session.execute(sql_text(
+                        """
+                        UPDATE chunks c SET chunk_shared_asset_ids = array_append(
+                            coalesce(c.chunk_shared_asset_ids, '{}'), s.chunk_asset_id
+                        )
+                        FROM (
+                            SELECT DISTINCT chunk_project_id, chunk_hash, chunk_asset_id
+                            FROM chunks_staging
+                        ) s
+                        WHERE c.chunk_project_id = s.chunk_project_id
+                        AND c.chunk_hash = s.chunk_hash
+                        AND c.chunk_asset_id <> s.chunk_asset_id
+                        AND NOT s.chunk_asset_id = ANY(coalesce(c.chunk_shared_asset_ids, '{}'))
+                        """
+                    ))
+
+        for chunk in chunks:
+            chunk.chunk_id = inserted_ids.get(str(chunk.chunk_uuid))
+
+        return [chunk.chunk_id for chunk in chunks if chunk.chunk_id is not None]
 
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         async with self.db_client() as session:
@@ -50,6 +197,133 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return result.rowcount
     
+    async def delete_chunks_by_asset_id(self, asset_id: int):
+        async with self.db_client() as session:
+            stmt = delete(DataChunk).where(DataChunk.chunk_asset_id == asset_id)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def release_asset_chunks(self, project_id: int, asset_id: int):
+        """Detach an asset from its chunks before they are deleted; returns the ids to delete.
+
+        Chunks whose text other assets share (their copies were skipped as
+        duplicates) are handed over to the first of those assets instead of
+        being deleted, and the asset stops sharing other assets' chunks.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    """
+                    UPDATE chunks SET
+                        chunk_asset_id = chunk_shared_asset_ids[1],
+                        chunk_shared_asset_ids = chunk_shared_asset_ids[2:]
+                    WHERE chunk_asset_id = :asset_id
+                    AND cardinality(chunk_shared_asset_ids) > 0
+                    """
+                ), {"asset_id": asset_id})
+                await session.execute(sql_text(
+                    """
+                    UPDATE chunks SET
+                        chunk_shared_asset_ids = array_remove(chunk_shared_asset_ids, :asset_id)
+                    WHERE chunk_project_id = :project_id
+                    AND :asset_id = ANY(chunk_shared_asset_ids)
+                    """
+                ), {"asset_id": asset_id, "project_id": project_id})
+                result = await session.execute(
+                    select(DataChunk.chunk_id).where(DataChunk.chunk_asset_id == asset_id)
+                )
+                return result.scalars().all()
+
+    async def mark_chunks_indexed(self, chunks_ids: list):
+        async with self.db_client() as session:
+            stmt = (
+                update(DataChunk)
+                .where(DataChunk.chunk_id.in_(list(chunks_ids)))
+                .values(chunk_indexed_at=func.now())
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def reset_project_chunks_indexed(self, project_id: int):
+        """Forget which chunks are indexed, e.g. after the collection was dropped."""
+        async with self.db_client() as session:
+            stmt = (
+                update(DataChunk)
+                .where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_indexed_at.is_not(None),
+                )
+                .values(chunk_indexed_at=None)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def sync_project_chunks_indexed(self, project_id: int, last_chunk_id: int):
+        """Mark exactly the chunks up to last_chunk_id as indexed, e.g. after a re-index."""
+        async with self.db_client() as session:
+            stmt = (
+                update(DataChunk)
+                .where(DataChunk.chunk_project_id == project_id)
+                .values(
+                    chunk_indexed_at=case(
+                        (DataChunk.chunk_id <= last_chunk_id, func.now()), else_=None
+                    )
+                )
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+    async def get_project_chunks_after(
+        self,
+        project_id: int,
+        last_chunk_id: int = 0,
+        page_size: int = 50,
+        only_unindexed: bool = False,
+    ):
+        """Keyset page: the next page_size chunks with chunk_id > last_chunk_id."""
+        async with self.db_client() as session:
+            stmt = (
+                select(DataChunk)
+                .where(
+                    DataChunk.chunk_project_id == project_id,
+                    DataChunk.chunk_id > last_chunk_id,
+                )
+                .order_by(DataChunk.chunk_id)
+                .limit(page_size)
+            )
+            if only_unindexed:
+                stmt = stmt.where(DataChunk.chunk_indexed_at.is_(None))
+            result = await session.execute(stmt)
+            records = result.scalars().all()
+        return records
+
+    async def iterate_project_chunks(
+        self, project_id: int, page_size: int = 100, only_unindexed: bool = False
+    ):
+        """Stream a project's chunks in chunk_id order, one page at a time.
+
+        Each page seeks on (chunk_project_id, chunk_id) instead of skipping
+        the previous pages, so a full scan stays linear in the chunk count.
+        With only_unindexed, chunks already in the vector db are skipped
+        through the partial index on unindexed chunks.
+        """
+        last_chunk_id = 0
+        while True:
+            chunks = await self.get_project_chunks_after(
+                project_id=project_id,
+                last_chunk_id=last_chunk_id,
+                page_size=page_size,
+                only_unindexed=only_unindexed,
+            )
+            if not chunks:
+                break
+            yield chunks
+            last_chunk_id = chunks[-1].chunk_id
+
     async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         async with self.db_client() as session:
             stmt = select(DataChunk).where(DataChunk.chunk_project_id == project_id).offset((page_no - 1) * page_size).limit(page_size)
@@ -58,10 +332,16 @@ class ChunkModel(BaseDataModel):
         return records
     
 
-    async def get_total_chunks_count(self, project_id: ObjectId):
+    async def get_total_chunks_count(
+        self, project_id: ObjectId, only_unindexed: bool = False, max_chunk_id: int = None
+    ):
         count = 0
         async with self.db_client() as session:
             stmt = select(func.count(DataChunk.chunk_id)).where(DataChunk.chunk_project_id == project_id)
+            if only_unindexed:
+                stmt = stmt.where(DataChunk.chunk_indexed_at.is_(None))
+            if max_chunk_id is not None:
+                stmt = stmt.where(DataChunk.chunk_id <= max_chunk_id)
             result = await session.execute(stmt)
             count = result.scalar()
         return count
\ No newline at end of file
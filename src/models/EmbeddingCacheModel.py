@@ -0,0 +1,63 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemas import EmbeddingCache
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+
+class EmbeddingCacheModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def get_embeddings(
+        self,
+        embedding_provider: str,
+        embedding_model_id: str,
+        document_type: str,
+        text_hashes: list,
+    ):
+        """Batch lookup; returns {text_hash: embedding} for the hashes found."""
+        if not text_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            stmt = select(EmbeddingCache.text_hash, EmbeddingCache.embedding).where(
+                EmbeddingCache.embedding_provider == embedding_provider,
+                EmbeddingCache.embedding_model_id == embedding_model_id,
+                EmbeddingCache.document_type == document_type,
+                EmbeddingCache.text_hash.in_(text_hashes),
+            )
+            result = await session.execute(stmt)
+            records = result.all()
+        return {record.text_hash: record.embedding for record in records}
+
+    async def insert_embeddings(
+        self,
+        embedding_provider: str,
+        embedding_model_id: str,
+        document_type: str,
+        embeddings: dict,
+    ):
+        """Store {text_hash: embedding}; entries already cached are left as is."""
+        if not embeddings:
+            return 0
+
+        async with self.db_client() as session:
+            stmt = insert(EmbeddingCache).values([
+                {
+                    "embedding_provider": embedding_provider,
+                    "embedding_model_id": embedding_model_id,
+                    "document_type": document_type,
+                    "text_hash": text_hash,
+                    "embedding": embedding,
+                }
+                for text_hash, embedding in embeddings.items()
+            ]).on_conflict_do_nothing()
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
@@ -0,0 +1,65 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemas import Job
+from sqlalchemy.future import select
+from sqlalchemy import func, update
+from datetime import timedelta
+
+class JobModel(BaseDataModel):
+
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client)
+        return instance
+
+    async def create_job(self, job: Job):
+
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int):
+
+        async with self.db_client() as session:
+            result = await session.execute(select(Job).where(Job.job_id == job_id))
+            job = result.scalar_one_or_none()
+        return job
+
+    async def get_job_by_uuid(self, job_uuid: str):
+
+        async with self.db_client() as session:
+            result = await session.execute(select(Job).where(Job.job_uuid == job_uuid))
+            job = result.scalar_one_or_none()
+        return job
+
+    async def update_job(self, job_id: int, values: dict, only_statuses: list = None):
+        """Update a job; with only_statuses the update applies only while the job is in one of them."""
+
+        async with self.db_client() as session:
+            stmt = update(Job).where(Job.job_id == job_id)
+            if only_statuses:
+                stmt = stmt.where(Job.job_status.in_(only_statuses))
+            result = await session.execute(stmt.values(**values))
+            await session.commit()
+        return result.rowcount
+
+    async def fail_stale_jobs(self, stale_after_seconds: float, only_statuses: list, values: dict):
+        """Update jobs in only_statuses whose row was last written more than stale_after_seconds ago."""
+
+        last_write = func.coalesce(Job.updated_at, Job.created_at)
+        async with self.db_client() as session:
+            stmt = (
+                update(Job)
+                .where(Job.job_status.in_(only_statuses))
+                .where(last_write < func.now() - timedelta(seconds=stale_after_seconds))
+                .values(**values)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemas import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 class ProjectModel(BaseDataModel):
 
@@ -40,6 +40,27 @@ class ProjectModel(BaseDataModel):
                 else:
                     return project
 
+    async def switch_project_vector_collection(
+        self, project_id: int, old_collection: dict, new_collection: dict
+    ) -> bool:
+        """Point the project at new_collection if it still points at old_collection.
+
+        A single conditional UPDATE, so searches see either collection and a
+        concurrent switch makes this one fail instead of being overwritten.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = (
+                    update(Project)
+                    .where(
+                        Project.project_id == project_id,
+                        Project.project_vector_collection.is_not_distinct_from(old_collection),
+                    )
+                    .values(project_vector_collection=new_collection)
+                )
+                result = await session.execute(stmt)
+        return result.rowcount > 0
+
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
         async with self.db_client() as session:
@@ -1,2 +1,2 @@
 from .enums.ResponseEnums import ResponseSignal
-from .enums.ProcessingEnum import ProcessingEnum
\ No newline at end of file
+from .enums.ProcessingEnum import ProcessingEnum, SplitterEnum, ChunkBoundaryEnum
\ No newline at end of file
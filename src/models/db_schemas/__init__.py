@@ -1,4 +1,11 @@
 # from .project import Project
 # from .data_chunk import DataChunk , RetrievedDocument
 # from .asset import Asset
-from .minirag.schemes import Asset, DataChunk, Project, RetrievedDocument
+from .minirag.schemes import (
+    Asset,
+    DataChunk,
+    EmbeddingCache,
+    Job,
+    Project,
+    RetrievedDocument,
+)
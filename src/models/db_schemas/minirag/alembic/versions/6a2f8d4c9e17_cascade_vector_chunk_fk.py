@@ -0,0 +1,61 @@
+"""Cascade chunk deletes to pgvector collections
+
+Revision ID: 6a2f8d4c9e17
+Revises: 8f4c1a7e3d95
+Create Date: 2025-10-14 11:02:37.408215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a2f8d4c9e17'
+down_revision: Union[str, Sequence[str], None] = '8f4c1a7e3d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Collection tables are created at runtime by PGVectorProvider, so their
+# foreign keys to chunks are found in the catalog. Partitions inherit the
+# constraint of their parent table and are skipped (conparentid).
+RECREATE_CHUNK_FKS_SQL = """
+DO $$
+DECLARE
+    fk record;
+BEGIN
+    FOR fk IN
+        SELECT conrelid::regclass AS table_name, conname
+        FROM pg_constraint
+        WHERE contype = 'f'
+        AND confrelid = 'chunks'::regclass
+        AND conrelid <> 'chunks'::regclass
+        AND conparentid = 0
+        AND confdeltype <> '{delete_action}'
+    LOOP
+        EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.table_name, fk.conname);
+        EXECUTE format(
+            'ALTER TABLE %s ADD CONSTRAINT %I FOREIGN KEY (chunk_id) '
+            'REFERENCES chunks(chunk_id) {on_delete}',
+            fk.table_name, fk.conname
+        );
+    END LOOP;
+END $$;
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # vectors of deleted chunks go with them, in every collection of the project
+    op.execute(sa.text(
+        RECREATE_CHUNK_FKS_SQL.format(delete_action='c', on_delete='ON DELETE CASCADE')
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text(
+        RECREATE_CHUNK_FKS_SQL.format(delete_action='a', on_delete='')
+    ))
@@ -0,0 +1,55 @@
+"""Add chunk hash
+
+Revision ID: 7c1e9a4b2f3d
+Revises: 4943547c1891
+Create Date: 2025-10-02 18:21:07.512904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a4b2f3d'
+down_revision: Union[str, Sequence[str], None] = '4943547c1891'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chunks', sa.Column('chunk_hash', sa.String(length=64), nullable=True))
+    op.add_column('chunks', sa.Column('chunk_shared_asset_ids', postgresql.ARRAY(sa.Integer()), nullable=True))
+
+    # hash the chunks stored so far, with the same normalization as
+    # ChunkModel.get_chunk_hash (lowercase, collapsed whitespace)
+    op.execute(sa.text(
+        """
+        UPDATE chunks SET chunk_hash = encode(sha256(convert_to(
+            lower(btrim(regexp_replace(chunk_text, '\\s+', ' ', 'g'))), 'UTF8'
+        )), 'hex')
+        WHERE chunk_hash IS NULL
+        """
+    ))
+    # only the oldest copy per project keeps its hash, so the unique index can
+    # be built over duplicates stored before it existed (non-NULL ones included)
+    op.execute(sa.text(
+        """
+        UPDATE chunks c SET chunk_hash = NULL
+        FROM chunks original
+        WHERE original.chunk_project_id = c.chunk_project_id
+        AND original.chunk_hash = c.chunk_hash
+        AND original.chunk_id < c.chunk_id
+        """
+    ))
+    op.create_index('ix_chunk_project_id_hash', 'chunks', ['chunk_project_id', 'chunk_hash'], unique=True, postgresql_where=sa.text('chunk_hash IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunk_project_id_hash', table_name='chunks', postgresql_where=sa.text('chunk_hash IS NOT NULL'))
+    op.drop_column('chunks', 'chunk_shared_asset_ids')
+    op.drop_column('chunks', 'chunk_hash')
@@ -15,6 +15,7 @@ class Asset(SQLAlchemyBase):
     asset_type = Column(String, nullable=False)  # e.g., "image", "document"
     asset_name = Column(String, nullable=False)
     asset_size = Column(Integer, nullable=False)  # Size in bytes
+    asset_hash = Column(String(64), nullable=True)  # SHA-256 fingerprint of the file content
        
     asset_config= Column(JSONB, nullable=True)  # JSONB column for flexible configuration
 
@@ -25,4 +26,5 @@ class Asset(SQLAlchemyBase):
     __table_args__ = (
         Index('ix_asset_project_id', asset_project_id),
         Index('ix_asset_type', asset_type),
+        Index('ix_asset_project_id_hash', asset_project_id, asset_hash),
     )
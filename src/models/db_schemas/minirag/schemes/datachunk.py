@@ -1,6 +1,6 @@
 from .minirag_base import SQLAlchemyBase
 from sqlalchemy import Column,Integer,String,DateTime,func,ForeignKey
-from sqlalchemy.dialects.postgresql import UUID,JSONB
+from sqlalchemy.dialects.postgresql import UUID,JSONB,ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
 import uuid
@@ -14,17 +14,30 @@ class DataChunk(SQLAlchemyBase):
 
     chunk_text = Column(String, nullable=False)  # The actual text content of the chunk
     chunk_metadata = Column(JSONB, nullable=True)  # JSONB column to store metadata
+    chunk_hash = Column(String(64), nullable=True)  # SHA-256 of the normalized chunk text
+    chunk_shared_asset_ids = Column(ARRAY(Integer), nullable=True)  # Other assets containing this text, whose copy was skipped
     chunk_order = Column(Integer, nullable=False)  # Order of the chunk in the original document
     chunk_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)  # Foreign key to Project table
     chunk_asset_id = Column(Integer, ForeignKey("assets.asset_id"), nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+    chunk_indexed_at = Column(DateTime(timezone=True), nullable=True)  # Set once the chunk is in the vector db
 
     project = relationship("Project", back_populates="chunks")
     asset = relationship("Asset", back_populates="chunks")
     __table_args__ = (
         Index('ix_chunk_asset_id', chunk_asset_id),
+        # one row per normalized text and project; copies stored with skip_duplicates off keep a NULL hash
+        Index(
+            'ix_chunk_project_id_hash', chunk_project_id, chunk_hash,
+            unique=True, postgresql_where=chunk_hash.is_not(None),
+        ),
+        Index('ix_chunk_project_id_chunk_id', chunk_project_id, chunk_id),
+        Index(
+            'ix_chunk_project_id_unindexed', chunk_project_id, chunk_id,
+            postgresql_where=chunk_indexed_at.is_(None),
+        ),
     )
 
 
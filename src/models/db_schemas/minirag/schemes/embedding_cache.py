@@ -0,0 +1,16 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column,String,DateTime,func,REAL
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+class EmbeddingCache(SQLAlchemyBase):
+    __tablename__ = "embedding_cache"
+
+    embedding_provider = Column(String, primary_key=True)  # e.g., "OPENAI", "COHERE"
+    embedding_model_id = Column(String, primary_key=True)
+    document_type = Column(String, primary_key=True)  # "DOCUMENT" or "QUERY"
+    text_hash = Column(String(64), primary_key=True)  # SHA-256 of the normalized text
+
+    embedding = Column(ARRAY(REAL), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
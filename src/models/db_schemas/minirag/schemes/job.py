@@ -0,0 +1,31 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column,Integer,String,DateTime,func,ForeignKey
+from sqlalchemy.dialects.postgresql import UUID,JSONB
+from sqlalchemy.orm import relationship
+from sqlalchemy import Index
+import uuid
+
+
+class Job(SQLAlchemyBase):
+    __tablename__ = "jobs"
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+    job_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+
+    job_type = Column(String, nullable=False)  # e.g., "process", "index"
+    job_status = Column(String, nullable=False)  # e.g., "queued", "running", "completed"
+    job_progress = Column(JSONB, nullable=True)  # counters reported while the job runs
+    job_result = Column(JSONB, nullable=True)  # final response payload or error
+
+    job_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)  # Foreign key to Project table
+    project = relationship("Project", back_populates="jobs")
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index('ix_job_project_id', job_project_id),
+        Index('ix_job_status', job_status),
+    )
@@ -10,9 +10,12 @@ class Project(SQLAlchemyBase):
     project_id = Column(Integer, primary_key=True, autoincrement=True)
     project_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
     chat_history = Column(JSONB, nullable=True)
+    # live vector collection: {"collection_name", "embedding_model_id", "embedding_size"}
+    project_vector_collection = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
     chunks = relationship("DataChunk", back_populates="project")
     assets = relationship("Asset", back_populates="project")
+    jobs = relationship("Job", back_populates="project")
     
\ No newline at end of file
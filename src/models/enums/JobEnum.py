@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class JobTypeEnum(Enum):
+    PROCESS = "process"
+    INDEX = "index"
+    PIPELINE = "pipeline"
+    REINDEX = "reindex"
+
+
+class JobStatusEnum(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
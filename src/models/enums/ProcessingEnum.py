@@ -3,3 +3,14 @@ from enum import Enum
 class ProcessingEnum(Enum):
     TXT = ".txt"
     PDF = ".pdf"
+
+
+class SplitterEnum(Enum):
+    SIMPLE = "simple"
+    SLIDING_WINDOW = "sliding_window"
+
+
+class ChunkBoundaryEnum(Enum):
+    NONE = "none"
+    SENTENCE = "sentence"
+    PARAGRAPH = "paragraph"
@@ -23,4 +23,22 @@ class ResponseSignal(Enum):
     CHAT_ANSWER_ERROR = "chat_answer_error"
     CHAT_ANSWER_SUCCESS = "chat_answer_success"
     DEEP_RESEARCH_ERROR = "deep_research_error"
-    DEEP_RESEARCH_SUCCESS = "deep_research_success"
\ No newline at end of file
+    DEEP_RESEARCH_SUCCESS = "deep_research_success"
+    JOB_QUEUED = "job_queued"
+    JOB_NOT_FOUND = "job_not_found"
+    JOB_RETRIEVED = "job_retrieved"
+    JOB_CANCELLED = "job_cancelled"
+    JOB_ALREADY_FINISHED = "job_already_finished"
+    UPLOAD_SESSION_CREATED = "upload_session_created"
+    UPLOAD_SESSION_NOT_FOUND = "upload_session_not_found"
+    UPLOAD_SESSION_RETRIEVED = "upload_session_retrieved"
+    UPLOAD_PART_RECEIVED = "upload_part_received"
+    UPLOAD_PART_INVALID = "upload_part_invalid"
+    UPLOAD_INCOMPLETE = "upload_incomplete"
+    PIPELINE_SUCCESS = "pipeline_success"
+    PIPELINE_FAILED = "pipeline_failed"
+    REINDEX_SUCCESS = "reindex_success"
+    REINDEX_FAILED = "reindex_failed"
+    REINDEX_VERIFICATION_FAILED = "reindex_verification_failed"
+    REINDEX_MODEL_NOT_ALLOWED = "reindex_model_not_allowed"
+    VECTOR_DB_SEARCH_QUALITY_RETRIEVED = "vector_db_search_quality_retrieved"
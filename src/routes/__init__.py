@@ -1,4 +1,4 @@
 from .base import base_router
 from .data import data_router
 from .nlp import nlp_router
- 
\ No newline at end of file
+from .jobs import jobs_router
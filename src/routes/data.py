@@ -1,23 +1,41 @@
+import asyncio
+import functools
+import hashlib
 import logging
 import os
+import queue
+import time
+from typing import AsyncIterable
 
 import aiofiles
 from fastapi import APIRouter, Depends, Request, UploadFile, status
 from fastapi.responses import JSONResponse
 
-from controllers import DataController, ProcessController, ProjectController, NLPController
+from controllers import (
+    DataController,
+    NLPController,
+    PipelineController,
+    ProcessController,
+)
+from controllers.JobController import JobProgress
+from controllers.ProcessController import process_file_worker
 from helpers.config import Settings, get_settings
 from models import ResponseSignal
 from models.AssetModel import AssetModel
 from models.ChunkModel import ChunkModel
-from models.db_schemas import Asset, DataChunk
+from models.db_schemas import Asset, DataChunk, Project
 from models.enums.AssetTypeEnum import AssetTypeEnum
+from models.enums.JobEnum import JobTypeEnum
 from models.ProjectModel import ProjectModel
+from utils.metrics import observe_ingest_stage
 
-from .schemas.data import ProcessRequest
+from .schemas.data import PipelineRequest, ProcessRequest, UploadInitRequest
 
 logger = logging.getLogger("uvicorn.error")
 
+# chunk batches a pool worker may get ahead of the inserts, per file
+POOL_QUEUE_BATCHES = 2
+
 data_router = APIRouter(
     prefix="/api/v1/data",
     tags=["api_v1", "data"],
@@ -36,75 +54,385 @@ async def upload_data(
 
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
+    asset_record, result_signal = await store_uploaded_file(
+        app=request.app, project=project, file=file, app_settings=app_settings
+    )
+
+    if asset_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"signal": result_signal}
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
+            "file_id": str(asset_record.asset_id),
+        }
+    )
+
+
+async def store_uploaded_file(
+    app, project: Project, file: UploadFile, app_settings: Settings
+):
+    """Validate, write and register an uploaded file; returns (asset, signal)."""
+
     # validate the file properties
     data_controller = DataController()
 
     is_valid, result_signal = data_controller.validate_uploaded_file(file=file)
 
     if not is_valid:
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST, content={"signal": result_signal}
-        )
+        return None, result_signal
 
-    project_dir_path = ProjectController().get_project_path(project_id=project_id)
     file_path, file_id = data_controller.generate_unique_filepath(
-        orig_file_name=file.filename, project_id=project_id
+        orig_file_name=file.filename, project_id=project.project_id
     )
 
+    file_hash = hashlib.sha256()
     try:
         async with aiofiles.open(file_path, "wb") as f:
             while chunk := await file.read(app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                file_hash.update(chunk)
                 await f.write(chunk)
     except Exception as e:
 
         logger.error(f"Error while uploading file: {e}")
 
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"signal": ResponseSignal.FILE_UPLOAD_FAILED.value},
-        )
+        return None, ResponseSignal.FILE_UPLOAD_FAILED.value
 
     # store the assets into the database
-    asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
+    asset_model = await AssetModel.create_instance(db_client=app.db_client)
 
     asset_resource = Asset(
         asset_project_id=project.project_id,
         asset_type=AssetTypeEnum.FILE.value,
         asset_name=file_id,
         asset_size=os.path.getsize(file_path),
+        asset_hash=file_hash.hexdigest(),
     )
 
     asset_record = await asset_model.create_asset(asset=asset_resource)
 
+    return asset_record, ResponseSignal.FILE_UPLOAD_SUCCESS.value
+
+
+@data_router.post("/upload/{project_id}/resumable")
+async def init_resumable_upload(
+    request: Request, project_id: int, upload_request: UploadInitRequest
+):
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    data_controller = DataController()
+
+    is_valid, result_signal = data_controller.validate_file_properties(
+        content_type=upload_request.content_type,
+        file_size=upload_request.file_size,
+        max_size=data_controller.app_settings.FILE_RESUMABLE_MAX_SIZE,
+    )
+
+    if not is_valid:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"signal": result_signal}
+        )
+
+    _ = await asyncio.to_thread(
+        data_controller.delete_expired_upload_sessions, project_id=project.project_id
+    )
+
+    upload_state = await asyncio.to_thread(
+        data_controller.create_upload_session,
+        project_id=project.project_id,
+        orig_file_name=upload_request.file_name,
+        file_size=upload_request.file_size,
+        content_type=upload_request.content_type,
+    )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_CREATED.value,
+            "upload_id": upload_state["upload_id"],
+            "part_max_size": data_controller.app_settings.FILE_UPLOAD_PART_MAX_SIZE
+            * data_controller.size_scale,
+        }
+    )
+
+
+@data_router.get("/upload/{project_id}/resumable/{upload_id}")
+async def get_resumable_upload(request: Request, project_id: int, upload_id: str):
+
+    data_controller = DataController()
+    upload_state = await asyncio.to_thread(
+        data_controller.load_upload_session, project_id=project_id, upload_id=upload_id
+    )
+
+    if upload_state is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value},
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_SESSION_RETRIEVED.value,
+            "upload_id": upload_id,
+            "file_size": upload_state["file_size"],
+            "received_ranges": upload_state["received_ranges"],
+            "is_complete": data_controller.is_upload_complete(upload_state),
+        }
+    )
+
+
+@data_router.put("/upload/{project_id}/resumable/{upload_id}")
+async def append_resumable_upload_part(
+    request: Request,
+    project_id: int,
+    upload_id: str,
+    offset: int,
+    app_settings: Settings = Depends(get_settings),
+):
+
+    data_controller = DataController()
+    upload_state = await asyncio.to_thread(
+        data_controller.load_upload_session, project_id=project_id, upload_id=upload_id
+    )
+
+    if upload_state is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value},
+        )
+
+    part_max_size = app_settings.FILE_UPLOAD_PART_MAX_SIZE * data_controller.size_scale
+    if offset < 0 or offset >= upload_state["file_size"]:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.UPLOAD_PART_INVALID.value},
+        )
+
+    asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
+
+    async with data_controller.get_upload_lock(
+        upload_id
+    ), asset_model.lock_upload_session(upload_id):
+        upload_state = await asyncio.to_thread(
+            data_controller.load_upload_session,
+            project_id=project_id,
+            upload_id=upload_id,
+        )
+        # completed (and deleted) while this part waited for the lock
+        if upload_state is None:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value},
+            )
+        hasher = data_controller.get_upload_hasher(upload_state, offset=offset)
+
+        written = 0
+        try:
+            async with aiofiles.open(upload_state["file_path"], "r+b") as f:
+                await f.seek(offset)
+                async for chunk in request.stream():
+                    written += len(chunk)
+                    if (
+                        written > part_max_size
+                        or offset + written > upload_state["file_size"]
+                    ):
+                        raise ValueError("part exceeds its allowed size")
+                    if hasher:
+                        hasher.update(chunk)
+                    await f.write(chunk)
+        except Exception as e:
+
+            logger.error(f"Error while uploading part: {e}")
+
+            # the running hash now covers bytes that were never acknowledged
+            if hasher:
+                data_controller.upload_hashers.pop(upload_id, None)
+
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"signal": ResponseSignal.UPLOAD_PART_INVALID.value},
+            )
+
+        if written > 0:
+            upload_state = data_controller.add_received_range(
+                upload_state, start=offset, end=offset + written
+            )
+        if hasher:
+            upload_state["hashed_offset"] = offset + written
+        await asyncio.to_thread(
+            data_controller.save_upload_session,
+            project_id=project_id,
+            upload_state=upload_state,
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.UPLOAD_PART_RECEIVED.value,
+            "upload_id": upload_id,
+            "received_ranges": upload_state["received_ranges"],
+            "is_complete": data_controller.is_upload_complete(upload_state),
+        }
+    )
+
+
+@data_router.post("/upload/{project_id}/resumable/{upload_id}/complete")
+async def complete_resumable_upload(request: Request, project_id: int, upload_id: str):
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    data_controller = DataController()
+
+    # unknown ids are turned away before they get a lock entry
+    upload_state = await asyncio.to_thread(
+        data_controller.load_upload_session,
+        project_id=project.project_id,
+        upload_id=upload_id,
+    )
+    if upload_state is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value},
+        )
+
+    asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
+
+    # the session is read, turned into an asset and deleted under the lock,
+    # so concurrent complete calls cannot create two assets for one upload
+    async with data_controller.get_upload_lock(
+        upload_id
+    ), asset_model.lock_upload_session(upload_id):
+        upload_state = await asyncio.to_thread(
+            data_controller.load_upload_session,
+            project_id=project.project_id,
+            upload_id=upload_id,
+        )
+
+        # completed by a concurrent call while this one waited for the lock
+        if upload_state is None:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"signal": ResponseSignal.UPLOAD_SESSION_NOT_FOUND.value},
+            )
+
+        if not data_controller.is_upload_complete(upload_state):
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.UPLOAD_INCOMPLETE.value,
+                    "received_ranges": upload_state["received_ranges"],
+                },
+            )
+
+        file_hash = await asyncio.to_thread(
+            data_controller.finalize_upload_hash, upload_state
+        )
+
+        # store the assets into the database
+        asset_resource = Asset(
+            asset_project_id=project.project_id,
+            asset_type=AssetTypeEnum.FILE.value,
+            asset_name=upload_id,
+            asset_size=upload_state["file_size"],
+            asset_hash=file_hash,
+        )
+
+        asset_record = await asset_model.create_asset(asset=asset_resource)
+        await asyncio.to_thread(
+            data_controller.delete_upload_session,
+            project_id=project.project_id,
+            upload_id=upload_id,
+        )
+
     return JSONResponse(
         content={
             "signal": ResponseSignal.FILE_UPLOAD_SUCCESS.value,
             "file_id": str(asset_record.asset_id),
         }
     )
+
+
+async def insert_chunks_batch(
+    chunk_model: ChunkModel, chunks: list, progress: JobProgress = None
+):
+    started_at = time.monotonic()
+    inserted = await chunk_model.insert_many_chunks(chunks=chunks)
+    observe_ingest_stage(
+        "store",
+        project_id=chunks[0].chunk_project_id,
+        provider="postgres",
+        started_at=started_at,
+        items=len(chunks),
+    )
+    if progress:
+        await progress.update(chunks_processed=len(chunks), chunks_inserted=inserted)
+    return inserted
+
+
+async def read_pool_chunk_batches(chunk_queue, future):
+    """Yield the chunk batches a pool worker sends until its None sentinel."""
+
+    def get_batch():
+        while True:
+            try:
+                return chunk_queue.get(timeout=1)
+            except queue.Empty:
+                # the worker died without sending its sentinel
+                if future.done():
+                    return None
+
+    while (batch := await asyncio.to_thread(get_batch)) is not None:
+        yield batch
+
+
+async def insert_file_chunk_batches(
+    chunk_model: ChunkModel,
+    project_id: int,
+    asset_id: int,
+    chunk_batches: AsyncIterable,
+    progress: JobProgress = None,
+):
+    """Insert a file's chunks as their batches arrive; returns (produced, inserted) counts."""
+    no_chunks = 0
+    no_records = 0
+
+    async for batch in chunk_batches:
+        file_chunks_records = [
+            DataChunk(
+                chunk_text=chunk.page_content,
+                chunk_metadata=chunk.metadata,
+                chunk_order=no_chunks + i + 1,
+                chunk_project_id=project_id,
+                chunk_asset_id=asset_id,
+            )
+            for i, chunk in enumerate(batch)
+        ]
+        no_chunks += len(file_chunks_records)
+        if file_chunks_records:
+            no_records += await insert_chunks_batch(
+                chunk_model, file_chunks_records, progress
+            )
+
+    return no_chunks, no_records
+
+
 @data_router.post("/process/{project_id}")
 async def process_endpoint(
     request: Request, project_id: int, process_request: ProcessRequest
 ):
 
-    chunk_size = process_request.chunk_size
-    overlap_size = process_request.overlap_size
-    do_reset = process_request.do_reset
-    nlp_controller = NLPController(
-        vectordb_client=request.app.vector_db_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser, 
-
-    )
-
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
 
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     asset_model = await AssetModel.create_instance(db_client=request.app.db_client)
 
-    project_files_ids = {}
+    project_assets = []
     if process_request.file_id:
         asset_record = await asset_model.get_asset_record(
             asset_project_id=project.project_id, asset_name=process_request.file_id
@@ -118,20 +446,16 @@ async def process_endpoint(
                 },
             )
 
-        project_files_ids = {asset_record.asset_id: asset_record.asset_name}
+        project_assets = [asset_record]
 
     else:
 
-        project_files = await asset_model.get_all_project_assets(
+        project_assets = await asset_model.get_all_project_assets(
             asset_project_id=project.project_id,
             asset_type=AssetTypeEnum.FILE.value,
         )
 
-        project_files_ids = {
-            record.asset_id: record.asset_name for record in project_files
-        }
-
-    if len(project_files_ids) == 0:
+    if len(project_assets) == 0:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -139,61 +463,455 @@ async def process_endpoint(
             },
         )
 
-    process_controller = ProcessController(project_id=project_id,embedding_client=request.app.embedding_client)
+    process_job = functools.partial(
+        process_project_assets,
+        app=request.app,
+        project=project,
+        project_assets=project_assets,
+        process_request=process_request,
+    )
+
+    if process_request.do_async == 1:
+        job = await request.app.job_controller.submit(
+            project_id=project.project_id,
+            job_type=JobTypeEnum.PROCESS.value,
+            job_fn=process_job,
+        )
+        return JSONResponse(
+            content={
+                "signal": ResponseSignal.JOB_QUEUED.value,
+                "job_id": str(job.job_uuid),
+            }
+        )
+
+    status_code, content = await process_job(progress=JobProgress())
+    return JSONResponse(status_code=status_code, content=content)
+
+
+async def process_project_assets(
+    progress: JobProgress,
+    app,
+    project: Project,
+    project_assets: list,
+    process_request: ProcessRequest,
+):
+    """Chunk and store the given assets; returns (status_code, response content)."""
+    chunk_size = process_request.chunk_size
+    overlap_size = process_request.overlap_size
+    do_reset = process_request.do_reset
+    embedding_client = app.embedding_clients.get_for_project(project)
+    nlp_controller = NLPController(
+        vectordb_client=app.vector_db_client,
+        generation_client=app.generation_client,
+        embedding_client=embedding_client,
+        template_parser=app.template_parser,
+    )
+
+    asset_model = await AssetModel.create_instance(db_client=app.db_client)
+
+    process_controller = ProcessController(
+        project_id=project.project_id, embedding_client=embedding_client
+    )
 
     no_records = 0
+    no_skipped = 0
     no_files = 0
+    no_unchanged_files = 0
 
-    chunk_model = await ChunkModel.create_instance(db_client=request.app.db_client)
+    chunk_model = await ChunkModel.create_instance(db_client=app.db_client)
 
     if do_reset == 1:
-        collection_name = nlp_controller.create_collection_name(
-            project_id=project.project_id
-        )
-        _ = await request.app.vector_db_client.delete_collection(
-            collection_name=collection_name
-        )
+        # a re-index shadow or a replaced collection would keep vectors of
+        # the deleted chunks (pgvector also cascades the delete to them)
+        for project_collection_name in await nlp_controller.get_project_collection_names(
+            project=project
+        ):
+            _ = await app.vector_db_client.delete_collection(
+                collection_name=project_collection_name
+            )
         _ = await chunk_model.delete_chunks_by_project_id(project_id=project.project_id)
-        
-    for asset_id, file_id in project_files_ids.items():
+        _ = await asset_model.reset_project_assets_processing(
+            asset_project_id=project.project_id
+        )
 
-        file_content = process_controller.get_file_content(file_id=file_id)
+    # fingerprint of what the assets are chunked with, compared on incremental runs
+    process_params = {
+        "chunk_size": chunk_size,
+        "overlap_size": overlap_size,
+        "splitter": process_request.splitter,
+        "boundary": process_request.boundary,
+    }
+
+    assets_by_id = {record.asset_id: record for record in project_assets}
+    for record in project_assets:
+        if record.asset_hash is None:
+            # hashing reads the whole file, keep it off the event loop
+            record.asset_hash = await asyncio.to_thread(
+                process_controller.get_file_hash, file_id=record.asset_name
+            )
+            if record.asset_hash:
+                _ = await asset_model.update_asset_record(
+                    asset_id=record.asset_id, values={"asset_hash": record.asset_hash}
+                )
+
+    async def mark_asset_processed(asset_id: int):
+        record = assets_by_id[asset_id]
+        record.asset_config = {
+            **(record.asset_config or {}),
+            "processed": {"asset_hash": record.asset_hash, "params": process_params},
+        }
+        _ = await asset_model.update_asset_record(
+            asset_id=asset_id, values={"asset_config": record.asset_config}
+        )
 
-        if file_content is None:
-            logger.error(f"Error while processing file: {file_id}")
-            continue
+    def is_asset_processed(record) -> bool:
+        return bool(record.asset_hash) and (record.asset_config or {}).get(
+            "processed"
+        ) == {"asset_hash": record.asset_hash, "params": process_params}
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size,
+    project_files_ids = {}
+    if process_request.do_incremental == 1 and do_reset != 1:
+        # processed before with other content or parameters: drop stale chunks
+        # from every collection of the project, see the reset above
+        project_collection_names = await nlp_controller.get_project_collection_names(
+            project=project
         )
+        stale_hashes = set()
+        for record in project_assets:
+            processed = (record.asset_config or {}).get("processed")
+            if not processed or is_asset_processed(record):
+                continue
+
+            # text other assets still contain is handed over, not deleted
+            stale_chunks_ids = await chunk_model.release_asset_chunks(
+                project_id=project.project_id, asset_id=record.asset_id
+            )
+            if stale_chunks_ids:
+                for project_collection_name in project_collection_names:
+                    _ = await app.vector_db_client.delete_many(
+                        collection_name=project_collection_name,
+                        record_ids=stale_chunks_ids,
+                    )
+                _ = await chunk_model.delete_chunks_by_asset_id(
+                    asset_id=record.asset_id
+                )
+            stale_hashes.add(processed.get("asset_hash"))
+
+        if stale_hashes:
+            # copies outside this request (a single file_id) are chunked again too
+            for record in await asset_model.get_all_project_assets(
+                asset_project_id=project.project_id,
+                asset_type=AssetTypeEnum.FILE.value,
+            ):
+                if (
+                    record.asset_id not in assets_by_id
+                    and is_asset_processed(record)
+                    and record.asset_hash in stale_hashes
+                ):
+                    project_assets.append(record)
+                    assets_by_id[record.asset_id] = record
+
+        # assets skipped as copies of the stale content own no chunks of their
+        # own, so everything processed with an old hash is chunked again
+        requeued_ids = {
+            record.asset_id
+            for record in project_assets
+            if is_asset_processed(record) and record.asset_hash in stale_hashes
+        }
 
-        if file_chunks is None or len(file_chunks) == 0:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"signal": ResponseSignal.PROCESSING_FAILED.value},
+        processed_hashes = {
+            record.asset_hash
+            for record in project_assets
+            if is_asset_processed(record) and record.asset_id not in requeued_ids
+        }
+
+        for record in project_assets:
+            if is_asset_processed(record) and record.asset_id not in requeued_ids:
+                no_unchanged_files += 1
+                continue
+
+            if record.asset_hash and record.asset_hash in processed_hashes:
+                # same content already chunked under another file id
+                await mark_asset_processed(record.asset_id)
+                no_unchanged_files += 1
+                continue
+
+            project_files_ids[record.asset_id] = record.asset_name
+    else:
+        project_files_ids = {
+            record.asset_id: record.asset_name for record in project_assets
+        }
+
+    progress.set_total(files_processed=len(project_files_ids))
+
+    if process_request.do_parallel == 1:
+        # at most one file per pool worker in flight; the rest wait here
+        # instead of queueing their work (and results) up front
+        pool_slots = asyncio.Semaphore(get_settings().PROCESS_POOL_MAX_WORKERS)
+
+        async def process_in_pool(asset_id, file_id):
+            async with pool_slots:
+                # stage metrics recorded inside a pool worker stay in that process,
+                # so the worker call is observed here as one extract_chunk step
+                # (which includes waiting for the inserts it streams into)
+                started_at = time.monotonic()
+                chunk_queue = app.process_manager.Queue(maxsize=POOL_QUEUE_BATCHES)
+                future = app.process_pool.submit(
+                    process_file_worker,
+                    chunk_queue,
+                    project.project_id,
+                    file_id,
+                    chunk_size,
+                    overlap_size,
+                    process_request.splitter,
+                    process_request.boundary,
+                )
+                file_chunks_count, file_records = await insert_file_chunk_batches(
+                    chunk_model=chunk_model,
+                    project_id=project.project_id,
+                    asset_id=asset_id,
+                    chunk_batches=read_pool_chunk_batches(chunk_queue, future),
+                    progress=progress,
+                )
+                produced_count = await asyncio.wrap_future(future)
+                observe_ingest_stage(
+                    "extract_chunk",
+                    project_id=project.project_id,
+                    provider=process_request.splitter,
+                    started_at=started_at,
+                    items=file_chunks_count,
+                )
+                if produced_count is None:
+                    return asset_id, file_id, None, 0
+                return asset_id, file_id, file_chunks_count, file_records
+
+        tasks = [
+            asyncio.ensure_future(process_in_pool(asset_id, file_id))
+            for asset_id, file_id in project_files_ids.items()
+        ]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                asset_id, file_id, file_chunks_count, file_records = await task
+
+                if file_chunks_count is None:
+                    logger.error(f"Error while processing file: {file_id}")
+                    continue
+
+                if file_chunks_count == 0:
+                    return status.HTTP_400_BAD_REQUEST, {
+                        "signal": ResponseSignal.PROCESSING_FAILED.value
+                    }
+
+                no_records += file_records
+                no_skipped += file_chunks_count - file_records
+                no_files += 1
+                await mark_asset_processed(asset_id)
+                await progress.update(files_processed=1)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    else:
+        for asset_id, file_id in project_files_ids.items():
+
+            file_content = await asyncio.to_thread(
+                process_controller.get_file_content, file_id=file_id
             )
 
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i + 1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id,
+            if file_content is None:
+                logger.error(f"Error while processing file: {file_id}")
+                continue
+
+            # extraction and chunking are blocking, so batches are pulled in a thread
+            file_chunks = process_controller.process_file_content(
+                file_content=file_content,
+                file_id=file_id,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+                splitter=process_request.splitter,
+                boundary=process_request.boundary,
             )
-            for i, chunk in enumerate(file_chunks)
-        ]
 
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
-        no_files += 1
+            file_chunks_count, file_records = await insert_file_chunk_batches(
+                chunk_model=chunk_model,
+                project_id=project.project_id,
+                asset_id=asset_id,
+                chunk_batches=PipelineController.iterate_in_thread(
+                    file_chunks, batch_size=1000
+                ),
+                progress=progress,
+            )
 
-    return JSONResponse(
-        content={
-            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_files": no_files,
+            if file_chunks_count == 0:
+                return status.HTTP_400_BAD_REQUEST, {
+                    "signal": ResponseSignal.PROCESSING_FAILED.value
+                }
+
+            no_records += file_records
+            no_skipped += file_chunks_count - file_records
+            no_files += 1
+            await mark_asset_processed(asset_id)
+            await progress.update(files_processed=1)
+
+    return status.HTTP_200_OK, {
+        "signal": ResponseSignal.PROCESSING_SUCCESS.value,
+        "inserted_chunks": no_records,
+        "skipped_duplicate_chunks": no_skipped,
+        "processed_files": no_files,
+        "unchanged_files": no_unchanged_files,
+    }
+
+
+@data_router.post("/pipeline/{project_id}")
+async def pipeline_endpoint(
+    request: Request,
+    project_id: int,
+    file: UploadFile,
+    pipeline_request: PipelineRequest = Depends(),
+    app_settings: Settings = Depends(get_settings),
+):
+    """Upload a file and make it searchable in one pass.
+
+    Chunks stream from the splitter into the chunks table, the embedding
+    provider and the vector db concurrently instead of going through
+    /upload, /process and /index/push one after the other.
+    """
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    asset_record, result_signal = await store_uploaded_file(
+        app=request.app, project=project, file=file, app_settings=app_settings
+    )
+
+    if asset_record is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST, content={"signal": result_signal}
+        )
+
+    pipeline_job = functools.partial(
+        ingest_asset,
+        app=request.app,
+        project=project,
+        asset=asset_record,
+        pipeline_request=pipeline_request,
+    )
+
+    if pipeline_request.do_async == 1:
+        job = await request.app.job_controller.submit(
+            project_id=project.project_id,
+            job_type=JobTypeEnum.PIPELINE.value,
+            job_fn=pipeline_job,
+        )
+        return JSONResponse(
+            content={
+                "signal": ResponseSignal.JOB_QUEUED.value,
+                "file_id": str(asset_record.asset_id),
+                "job_id": str(job.job_uuid),
+            }
+        )
+
+    status_code, content = await pipeline_job(progress=JobProgress())
+    return JSONResponse(status_code=status_code, content=content)
+
+
+async def ingest_asset(
+    progress: JobProgress,
+    app,
+    project: Project,
+    asset: Asset,
+    pipeline_request: PipelineRequest,
+):
+    """Chunk, store, embed and index one asset; returns (status_code, response content)."""
+    # the model the project's live collection was built with
+    embedding_client = app.embedding_clients.get_for_project(project)
+    nlp_controller = NLPController(
+        vectordb_client=app.vector_db_client,
+        generation_client=app.generation_client,
+        embedding_client=embedding_client,
+        template_parser=app.template_parser,
+    )
+    pipeline_controller = PipelineController(
+        db_client=app.db_client,
+        vectordb_client=app.vector_db_client,
+        embedding_client=embedding_client,
+    )
+    process_controller = ProcessController(
+        project_id=project.project_id, embedding_client=embedding_client
+    )
+
+    file_content = process_controller.get_file_content(file_id=asset.asset_name)
+
+    if file_content is None:
+        logger.error(f"Error while processing file: {asset.asset_name}")
+        return status.HTTP_400_BAD_REQUEST, {
+            "signal": ResponseSignal.PROCESSING_FAILED.value
         }
+
+    file_chunks = process_controller.process_file_content(
+        file_content=file_content,
+        file_id=asset.asset_name,
+        chunk_size=pipeline_request.chunk_size,
+        overlap_size=pipeline_request.overlap_size,
+        splitter=pipeline_request.splitter,
+        boundary=pipeline_request.boundary,
     )
+
+    collection_name = nlp_controller.get_collection_name(project=project)
+    is_collection_created = await app.vector_db_client.create_collection(
+        collection_name=collection_name,
+        embedding_size=embedding_client.embedding_size,
+    )
+    if is_collection_created:
+        # chunks indexed into a dropped collection have to be pushed again
+        chunk_model = await ChunkModel.create_instance(db_client=app.db_client)
+        _ = await chunk_model.reset_project_chunks_indexed(project_id=project.project_id)
+
+    try:
+        counts = await pipeline_controller.ingest_file(
+            project=project,
+            asset=asset,
+            collection_name=collection_name,
+            file_chunks=file_chunks,
+            progress=progress,
+        )
+    except Exception as e:
+        logger.error(f"Error while running the ingestion pipeline: {e}")
+        return status.HTTP_500_INTERNAL_SERVER_ERROR, {
+            "signal": ResponseSignal.PIPELINE_FAILED.value,
+            "file_id": str(asset.asset_id),
+        }
+
+    if counts["chunks"] == 0:
+        return status.HTTP_400_BAD_REQUEST, {
+            "signal": ResponseSignal.PROCESSING_FAILED.value
+        }
+
+    # same fingerprint as /process, so incremental runs skip this asset
+    asset_model = await AssetModel.create_instance(db_client=app.db_client)
+    _ = await asset_model.update_asset_record(
+        asset_id=asset.asset_id,
+        values={
+            "asset_config": {
+                **(asset.asset_config or {}),
+                "processed": {
+                    "asset_hash": asset.asset_hash,
+                    "params": {
+                        "chunk_size": pipeline_request.chunk_size,
+                        "overlap_size": pipeline_request.overlap_size,
+                        "splitter": pipeline_request.splitter,
+                        "boundary": pipeline_request.boundary,
+                    },
+                },
+            }
+        },
+    )
+
+    return status.HTTP_200_OK, {
+        "signal": ResponseSignal.PIPELINE_SUCCESS.value,
+        "file_id": str(asset.asset_id),
+        "inserted_chunks": counts["inserted_chunks"],
+        "skipped_duplicate_chunks": counts["chunks"] - counts["inserted_chunks"],
+    }
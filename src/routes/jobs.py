@@ -0,0 +1,66 @@
+import logging
+import uuid
+
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+from models import ResponseSignal
+from models.JobModel import JobModel
+
+logger = logging.getLogger("uvicorn.error")
+
+jobs_router = APIRouter(
+    prefix="/api/v1/jobs",
+    tags=["api_v1", "jobs"],
+)
+
+
+async def get_job_record(request: Request, job_id: str):
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        return None
+
+    job_model = await JobModel.create_instance(db_client=request.app.db_client)
+    return await job_model.get_job_by_uuid(job_uuid=job_uuid)
+
+
+@jobs_router.get("/{job_id}")
+async def get_job_status(request: Request, job_id: str):
+    job = await get_job_record(request, job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.JOB_NOT_FOUND.value},
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            "job": request.app.job_controller.get_job_status(job),
+        }
+    )
+
+
+@jobs_router.post("/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: str):
+    job = await get_job_record(request, job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.JOB_NOT_FOUND.value},
+        )
+
+    is_cancelled = await request.app.job_controller.cancel(job)
+    if not is_cancelled:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"signal": ResponseSignal.JOB_ALREADY_FINISHED.value},
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_CANCELLED.value,
+            "job_id": job_id,
+        }
+    )
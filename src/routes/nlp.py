@@ -1,12 +1,18 @@
+import functools
 import logging
 
+from controllers.JobController import JobProgress
 from controllers.NLPController import NLPController
+from controllers.PipelineController import PipelineController
 from fastapi import APIRouter, Request, status
 from fastapi.responses import JSONResponse
+from helpers.config import get_settings
 from models import ResponseSignal
 from models.ChunkModel import ChunkModel
+from models.db_schemas import Project
+from models.enums.JobEnum import JobTypeEnum
 from models.ProjectModel import ProjectModel
-from routes.schemas.nlp import PushRequest, SearchRequest, ChatRequest
+from routes.schemas.nlp import PushRequest, ReindexRequest, SearchRequest, ChatRequest
 from tqdm.auto import tqdm
 logger = logging.getLogger("uvicorn.error")
 
@@ -16,7 +22,6 @@ nlp_router = APIRouter(prefix="/api/v1/nlp", tags=["api_v1", "nlp"])
 @nlp_router.post("/index/push/{project_id}")
 async def index_project(request: Request, project_id: int, push_request: PushRequest):
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
-    chunks_model = await ChunkModel.create_instance(db_client=request.app.db_client)
     project = await project_model.get_project_or_create_one(project_id=project_id)
 
     if not project:
@@ -24,69 +29,323 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": ResponseSignal.PROJECT_NOT_FOUND.value},
         )
+
+    index_job = functools.partial(
+        index_project_chunks,
+        app=request.app,
+        project=project,
+        push_request=push_request,
+    )
+
+    if push_request.do_async == 1:
+        job = await request.app.job_controller.submit(
+            project_id=project.project_id,
+            job_type=JobTypeEnum.INDEX.value,
+            job_fn=index_job,
+        )
+        return JSONResponse(
+            content={
+                "message": ResponseSignal.JOB_QUEUED.value,
+                "job_id": str(job.job_uuid),
+            }
+        )
+
+    status_code, content = await index_job(progress=JobProgress())
+    return JSONResponse(status_code=status_code, content=content)
+
+
+async def index_project_chunks(
+    progress: JobProgress, app, project: Project, push_request: PushRequest
+):
+    """Embed and insert the project chunks not indexed yet; returns (status_code, response content)."""
+    chunks_model = await ChunkModel.create_instance(db_client=app.db_client)
+    embedding_client = app.embedding_clients.get_for_project(project)
     nlp_controller = NLPController(
-        vectordb_client=request.app.vector_db_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser,
+        vectordb_client=app.vector_db_client,
+        generation_client=app.generation_client,
+        embedding_client=embedding_client,
+        template_parser=app.template_parser,
     )
 
     # Create collection if not exists
-    collection_name = nlp_controller.create_collection_name(
-        project_id=project.project_id
-    )
-    _ = await request.app.vector_db_client.create_collection(
+    collection_name = nlp_controller.get_collection_name(project=project)
+    is_collection_created = await app.vector_db_client.create_collection(
         collection_name=collection_name,
-        embedding_size=request.app.embedding_client.embedding_size,
+        embedding_size=embedding_client.embedding_size,
         do_reset=push_request.do_reset,
     )
+    if is_collection_created:
+        # a new (or reset) collection holds none of the chunks marked as indexed
+        _ = await chunks_model.reset_project_chunks_indexed(project_id=project.project_id)
+
+    pipeline_controller = PipelineController(
+        db_client=app.db_client,
+        vectordb_client=app.vector_db_client,
+        embedding_client=embedding_client,
+    )
+    page_size = pipeline_controller.app_settings.PIPELINE_EMBEDDING_BATCH_SIZE
 
+    # Setup Batching: only chunks not in the vector db yet are embedded
+    total_chunks_count = await chunks_model.get_total_chunks_count(project_id=project.project_id)
+    unindexed_chunks_count = await chunks_model.get_total_chunks_count(
+        project_id=project.project_id, only_unindexed=True
+    )
+    progress.set_total(chunks_inserted=unindexed_chunks_count)
+    pbar = tqdm(total=unindexed_chunks_count, desc="Indexing Chunks", unit="chunk",position=0)
+
+    async def read_chunk_pages():
+        async for chunks in chunks_model.iterate_project_chunks(
+            project_id=project.project_id, page_size=page_size, only_unindexed=True
+        ):
+            pbar.update(len(chunks))
+            yield chunks
+
+    # a large load builds a missing vector index once at the end instead of
+    # as soon as the threshold is crossed; an existing index stays live
+    use_bulk_load = unindexed_chunks_count * 2 >= total_chunks_count
+    if use_bulk_load:
+        await app.vector_db_client.begin_bulk_load(collection_name=collection_name)
+
+    # reads, embedding calls and vector writes overlap; see PipelineController
+    try:
+        inserted_items_count = await pipeline_controller.index_chunks(
+            collection_name=collection_name,
+            project_id=project.project_id,
+            chunk_pages=read_chunk_pages(),
+            progress=progress,
+        )
+    except Exception as e:
+        logger.error(f"Error while indexing chunks: {e}")
+        return status.HTTP_400_BAD_REQUEST, {
+            "message": ResponseSignal.INSERT_INTO_VECTOR_DB_ERROR.value
+        }
+    finally:
+        pbar.close()
+        index_report = {}
+        if use_bulk_load:
+            index_report = await app.vector_db_client.end_bulk_load(
+                collection_name=collection_name
+            )
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    page_size = 100
+    return status.HTTP_200_OK, {
+        "message": ResponseSignal.INSERT_INTO_VECTOR_DB_SUCCESS.value,
+        "inserted_items_count": inserted_items_count,
+        "already_indexed_count": total_chunks_count - unindexed_chunks_count,
+        "index_build_seconds": index_report.get("index_build_seconds"),
+    }
 
-    idx = 0
 
-    # Setup Batching
-    total_chunks_count = await chunks_model.get_total_chunks_count(project_id=project.project_id)
-    pbar = tqdm(total=total_chunks_count, desc="Indexing Chunks", unit="chunk",position=0)
-    while has_records:
-        chunks = await chunks_model.get_poject_chunks(
-            project_id=project.project_id, page_no=page_no, page_size=page_size
-        )
-        page_no += 1
-        if not chunks:
-            has_records = False
-            break
-
-        chunks_ids = [chunk.chunk_id for chunk in chunks]
-        idx += len(chunks)
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=chunks,
-            do_reset=push_request.do_reset,
-            chunks_ids=chunks_ids,
-            page_size=page_size
+@nlp_router.post("/index/reindex/{project_id}")
+async def reindex_project(
+    request: Request, project_id: int, reindex_request: ReindexRequest
+):
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": ResponseSignal.PROJECT_NOT_FOUND.value},
         )
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"message": ResponseSignal.INSERT_INTO_VECTOR_DB_ERROR.value},
-            )
-        pbar.update(len(chunks))
-        inserted_items_count += len(chunks)
+    # rejected before a job is queued; see EMBEDDING_ALLOWED_MODELS
+    if reindex_request.embedding_model_id is not None and not (
+        request.app.embedding_clients.is_allowed(
+            embedding_model_id=reindex_request.embedding_model_id,
+            embedding_size=reindex_request.embedding_size,
+        )
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": ResponseSignal.REINDEX_MODEL_NOT_ALLOWED.value},
+        )
 
+    # always a background job: the live collection keeps serving meanwhile
+    job = await request.app.job_controller.submit(
+        project_id=project.project_id,
+        job_type=JobTypeEnum.REINDEX.value,
+        job_fn=functools.partial(
+            reindex_project_chunks,
+            app=request.app,
+            project=project,
+            reindex_request=reindex_request,
+        ),
+    )
     return JSONResponse(
         content={
-            "message": ResponseSignal.INSERT_INTO_VECTOR_DB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count,
-        },
+            "message": ResponseSignal.JOB_QUEUED.value,
+            "job_id": str(job.job_uuid),
+        }
     )
 
 
+async def reindex_project_chunks(
+    progress: JobProgress, app, project: Project, reindex_request: ReindexRequest
+):
+    """Blue/green re-index: build a shadow collection, verify it, switch, then
+    drop the old one after REINDEX_DROP_DELAY_SECONDS.
+
+    Searches keep using the live collection until the project pointer is
+    switched. Chunks stored while the shadow was built are left unindexed,
+    so the next /index/push embeds them into the new collection.
+    """
+    settings = get_settings()
+    embedding_model_id = reindex_request.embedding_model_id or settings.EMBEDDING_MODEL_ID
+    embedding_size = reindex_request.embedding_size or settings.EMBEDDING_MODEL_SIZE
+
+    chunks_model = await ChunkModel.create_instance(db_client=app.db_client)
+    project_model = await ProjectModel.create_instance(db_client=app.db_client)
+    nlp_controller = NLPController(
+        vectordb_client=app.vector_db_client,
+        generation_client=app.generation_client,
+        embedding_client=app.embedding_clients.get_for_project(project),
+        template_parser=app.template_parser,
+    )
+
+    old_vector_collection = project.project_vector_collection
+    old_collection_name = nlp_controller.get_collection_name(project=project)
+    new_vector_collection = {
+        "collection_name": nlp_controller.create_reindex_collection_name(
+            project_id=project.project_id, embedding_size=embedding_size
+        ),
+        "embedding_model_id": embedding_model_id,
+        "embedding_size": embedding_size,
+    }
+    collection_name = new_vector_collection["collection_name"]
+
+    # own rate limits, so the re-index does not starve live queries
+    embedding_client = app.embedding_clients.build(
+        embedding_model_id=embedding_model_id,
+        embedding_size=embedding_size,
+        requests_per_minute=settings.REINDEX_EMBEDDING_RPM_LIMIT,
+        tokens_per_minute=settings.REINDEX_EMBEDDING_TPM_LIMIT,
+    )
+    pipeline_controller = PipelineController(
+        db_client=app.db_client,
+        vectordb_client=app.vector_db_client,
+        embedding_client=embedding_client,
+    )
+    page_size = pipeline_controller.app_settings.PIPELINE_EMBEDDING_BATCH_SIZE
+
+    total_chunks_count = await chunks_model.get_total_chunks_count(project_id=project.project_id)
+    progress.set_total(chunks_inserted=total_chunks_count)
+    read_cursor = {"last_chunk_id": 0}
+
+    async def read_chunk_pages():
+        async for chunks in chunks_model.iterate_project_chunks(
+            project_id=project.project_id, page_size=page_size
+        ):
+            read_cursor["last_chunk_id"] = chunks[-1].chunk_id
+            yield chunks
+
+    _ = await app.vector_db_client.create_collection(
+        collection_name=collection_name,
+        embedding_size=embedding_size,
+        do_reset=True,
+    )
+    await app.vector_db_client.begin_bulk_load(collection_name=collection_name)
+    try:
+        inserted_items_count = await pipeline_controller.index_chunks(
+            collection_name=collection_name,
+            project_id=project.project_id,
+            chunk_pages=read_chunk_pages(),
+            progress=progress,
+            mark_indexed=False,
+        )
+        index_report = await app.vector_db_client.end_bulk_load(
+            collection_name=collection_name
+        )
+    except BaseException as e:
+        # includes cancellation: the shadow collection is never left behind
+        logger.error(f"Error while re-indexing project {project.project_id}: {e}")
+        _ = await app.vector_db_client.delete_collection(collection_name=collection_name)
+        if not isinstance(e, Exception):
+            raise
+        return status.HTTP_400_BAD_REQUEST, {
+            "message": ResponseSignal.REINDEX_FAILED.value
+        }
+
+    # every chunk read must be in the shadow before it goes live
+    expected_count = await chunks_model.get_total_chunks_count(
+        project_id=project.project_id, max_chunk_id=read_cursor["last_chunk_id"]
+    )
+    records_count = await app.vector_db_client.count_records(collection_name=collection_name)
+    if records_count != expected_count:
+        logger.error(
+            f"Re-index of project {project.project_id} has {records_count} records, "
+            f"expected {expected_count}"
+        )
+        _ = await app.vector_db_client.delete_collection(collection_name=collection_name)
+        return status.HTTP_400_BAD_REQUEST, {
+            "message": ResponseSignal.REINDEX_VERIFICATION_FAILED.value,
+            "records_count": records_count,
+            "expected_count": expected_count,
+        }
+
+    is_switched = await project_model.switch_project_vector_collection(
+        project_id=project.project_id,
+        old_collection=old_vector_collection,
+        new_collection=new_vector_collection,
+    )
+    if not is_switched:
+        # another re-index switched the project first
+        _ = await app.vector_db_client.delete_collection(collection_name=collection_name)
+        return status.HTTP_409_CONFLICT, {
+            "message": ResponseSignal.REINDEX_FAILED.value
+        }
+
+    _ = await chunks_model.sync_project_chunks_indexed(
+        project_id=project.project_id, last_chunk_id=read_cursor["last_chunk_id"]
+    )
+
+    # let searches that resolved the old name before the switch finish; the
+    # job is done now and the drop does not hold a job slot while it waits
+    if old_collection_name != collection_name:
+        app.job_controller.call_later(
+            settings.REINDEX_DROP_DELAY_SECONDS,
+            functools.partial(
+                drop_replaced_collection,
+                app=app,
+                project_id=project.project_id,
+                collection_name=collection_name,
+                old_collection_name=old_collection_name,
+                last_chunk_id=read_cursor["last_chunk_id"],
+            ),
+        )
+
+    return status.HTTP_200_OK, {
+        "message": ResponseSignal.REINDEX_SUCCESS.value,
+        "collection_name": collection_name,
+        "embedding_model_id": embedding_model_id,
+        "inserted_items_count": inserted_items_count,
+        "index_build_seconds": index_report.get("index_build_seconds"),
+    }
+
+
+async def drop_replaced_collection(
+    app,
+    project_id: int,
+    collection_name: str,
+    old_collection_name: str,
+    last_chunk_id: int,
+):
+    """Drop the collection a re-index replaced, after its grace period."""
+    project_model = await ProjectModel.create_instance(db_client=app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    # a push that resolved the old collection before the switch may have
+    # marked chunks indexed there since; unmark them so the next push embeds
+    # them into the live collection. A later re-index owns the state instead.
+    vector_collection = project.project_vector_collection or {}
+    if vector_collection.get("collection_name") == collection_name:
+        chunks_model = await ChunkModel.create_instance(db_client=app.db_client)
+        _ = await chunks_model.sync_project_chunks_indexed(
+            project_id=project_id, last_chunk_id=last_chunk_id
+        )
+
+    _ = await app.vector_db_client.delete_collection(collection_name=old_collection_name)
+
+
 @nlp_router.get("/index/info/{project_id}")
 async def get_project_index_info(request: Request, project_id: int):
 
@@ -96,7 +355,7 @@ async def get_project_index_info(request: Request, project_id: int):
     nlp_controller = NLPController(
         vectordb_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
+        embedding_client=request.app.embedding_clients.get_for_project(project),
         template_parser=request.app.template_parser,
     )
     collection_info = await nlp_controller.get_vector_db_collection_info(project=project)
@@ -110,6 +369,45 @@ async def get_project_index_info(request: Request, project_id: int):
 
 
 
+@nlp_router.get("/index/quality/{project_id}")
+async def get_project_index_quality(
+    request: Request,
+    project_id: int,
+    sample_size: int = 20,
+    limit: int = 10,
+    search_effort: int = None,
+):
+
+    project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
+    project = await project_model.get_project_or_create_one(project_id=project_id)
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vector_db_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_clients.get_for_project(project),
+        template_parser=request.app.template_parser,
+    )
+    quality_report = await nlp_controller.get_vector_db_search_quality(
+        project=project,
+        sample_size=sample_size,
+        limit=limit,
+        search_effort=search_effort,
+    )
+
+    if quality_report is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": ResponseSignal.VECTOR_DB_COLLECTION_NOT_FOUND.value},
+        )
+
+    return JSONResponse(
+        content={
+            "message": ResponseSignal.VECTOR_DB_SEARCH_QUALITY_RETRIEVED.value,
+            "quality": quality_report,
+        }
+    )
+
+
 @nlp_router.post("/index/search/{project_id}")
 async def search_index(request: Request, project_id: int, search_request: SearchRequest):
     project_model = await ProjectModel.create_instance(db_client=request.app.db_client)
@@ -124,7 +422,7 @@ async def search_index(request: Request, project_id: int, search_request: Search
     nlp_controller = NLPController(
         vectordb_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
+        embedding_client=request.app.embedding_clients.get_for_project(project),
         template_parser=request.app.template_parser,
     )
 
@@ -132,6 +430,7 @@ async def search_index(request: Request, project_id: int, search_request: Search
         project=project,
         text=search_request.text,
         limit=search_request.limit,
+        search_effort=search_request.search_effort,
     )
     if search_results is None:
         return JSONResponse(
@@ -161,7 +460,7 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
     nlp_controller = NLPController(
         vectordb_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
+        embedding_client=request.app.embedding_clients.get_for_project(project),
         template_parser=request.app.template_parser,
     )
 
@@ -199,7 +498,7 @@ async def chat(request: Request, project_id: int, chat_request: ChatRequest):
     nlp_controller = NLPController(
         vectordb_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
+        embedding_client=request.app.embedding_clients.get_for_project(project),
         template_parser=request.app.template_parser,
     )
 
@@ -235,7 +534,7 @@ async def deep_research(request: Request, project_id: int, chat_request: ChatReq
     nlp_controller = NLPController(
         vectordb_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
+        embedding_client=request.app.embedding_clients.get_for_project(project),
         template_parser=request.app.template_parser,
     )
 
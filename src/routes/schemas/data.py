@@ -1,9 +1,46 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
 
-class ProcessRequest(BaseModel):
+# values of SplitterEnum / ChunkBoundaryEnum, so unknown ones are rejected with 422
+Splitter = Literal["simple", "sliding_window"]
+ChunkBoundary = Literal["none", "sentence", "paragraph"]
+
+
+class ChunkingRequest(BaseModel):
+    chunk_size: Optional[int] = Field(default=100, ge=1)
+    overlap_size: Optional[int] = Field(default=20, ge=0)
+    # "simple" cuts on characters, "sliding_window" counts chunk/overlap sizes in tokens
+    splitter: Optional[Splitter] = "simple"
+    # only used by the sliding_window splitter
+    boundary: Optional[ChunkBoundary] = "none"
+
+    @model_validator(mode="after")
+    def check_overlap_size(self):
+        # a boundary cut can land at half the window, so a larger overlap would
+        # advance the window by a handful of tokens per chunk
+        if (
+            self.splitter == "sliding_window"
+            and self.overlap_size > self.chunk_size // 2
+        ):
+            raise ValueError("overlap_size must be at most half of chunk_size")
+        return self
+
+
+class ProcessRequest(ChunkingRequest):
     file_id: str = None
-    chunk_size: Optional[int] = 100
-    overlap_size: Optional[int] = 20
     do_reset: Optional[int] = 0
-    
\ No newline at end of file
+    do_parallel: Optional[int] = 0
+    # run as a background job and return its id instead of waiting
+    do_async: Optional[int] = 0
+    # skip assets already processed with the same fingerprint and parameters
+    do_incremental: Optional[int] = 0
+
+
+class PipelineRequest(ChunkingRequest):
+    do_async: Optional[int] = 0
+
+
+class UploadInitRequest(BaseModel):
+    file_name: str
+    file_size: int
+    content_type: str
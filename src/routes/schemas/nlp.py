@@ -1,13 +1,32 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from typing import Optional
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    # run as a background job and return its id instead of waiting
+    do_async: Optional[int] = 0
+
+
+class ReindexRequest(BaseModel):
+    # defaults to EMBEDDING_MODEL_ID / EMBEDDING_MODEL_SIZE; other models must
+    # be listed in EMBEDDING_ALLOWED_MODELS
+    embedding_model_id: Optional[str] = None
+    embedding_size: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_embedding_model(self):
+        # a size only means something for its model: mixing one with the
+        # default of the other builds a collection of the wrong dimension
+        if (self.embedding_model_id is None) != (self.embedding_size is None):
+            raise ValueError("embedding_model_id and embedding_size must be given together")
+        return self
 
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    # higher is slower with better recall: hnsw ef_search / ivfflat probes
+    search_effort: Optional[int] = None
 
 
 class ChatRequest(BaseModel):
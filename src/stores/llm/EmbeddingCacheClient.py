@@ -0,0 +1,149 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import List, Union
+
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+
+from .EmbeddingClientWrapper import EmbeddingClientWrapper
+from .LLMInterface import LLMInterface
+
+
+class EmbeddingCacheClient(EmbeddingClientWrapper):
+    """Wraps an embedding client and only sends cache misses to it.
+
+    Entries are keyed by (provider, embedding model, document type, hash of
+    the normalized text). Lookups go through an in-memory LRU first and then
+    the embedding_cache table; identical texts within a batch are embedded
+    once. The sync embed_text path only uses the LRU.
+    """
+
+    def __init__(
+        self,
+        embedding_client: LLMInterface,
+        embedding_provider: str,
+        db_client: object = None,
+        lru_size: int = 10000,
+    ):
+        super().__init__(embedding_client)
+        self.embedding_provider = embedding_provider
+        self.db_client = db_client
+        self.lru_size = lru_size
+        self.lru = OrderedDict()
+        self.cache_model = None
+
+        self.logger = logging.getLogger("uvicorn")
+
+    @staticmethod
+    def get_text_hash(text: str) -> str:
+        normalized_text = " ".join(text.split())
+        return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+    def lru_get(self, document_type: str, text_hash: str):
+        key = (self.embedding_model_id, document_type, text_hash)
+        embedding = self.lru.get(key)
+        if embedding is not None:
+            self.lru.move_to_end(key)
+        return embedding
+
+    def lru_put(self, document_type: str, text_hash: str, embedding: list):
+        key = (self.embedding_model_id, document_type, text_hash)
+        self.lru[key] = embedding
+        self.lru.move_to_end(key)
+        while len(self.lru) > self.lru_size:
+            self.lru.popitem(last=False)
+
+    def split_batch(self, texts: List[str], document_type: str):
+        """Hash the batch and resolve it against the LRU.
+
+        Returns (hashes per text, found embeddings, {missing hash: text}).
+        """
+        text_hashes = [self.get_text_hash(text) for text in texts]
+        found = {}
+        missing = {}
+        for text, text_hash in zip(texts, text_hashes):
+            if text_hash in found or text_hash in missing:
+                continue
+            embedding = self.lru_get(document_type, text_hash)
+            if embedding is not None:
+                found[text_hash] = embedding
+            else:
+                missing[text_hash] = text
+        return text_hashes, found, missing
+
+    def store_embeddings(
+        self, document_type: str, missing: dict, embeddings: list, found: dict
+    ):
+        new_embeddings = {}
+        for text_hash, embedding in zip(missing.keys(), embeddings):
+            embedding = list(embedding)
+            found[text_hash] = embedding
+            new_embeddings[text_hash] = embedding
+            self.lru_put(document_type, text_hash, embedding)
+        return new_embeddings
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        single_input = isinstance(text, str)
+        texts = [text] if single_input else list(text)
+
+        text_hashes, found, missing = self.split_batch(texts, document_type)
+        if missing:
+            embeddings = self.embedding_client.embed_text(
+                text=list(missing.values()), document_type=document_type
+            )
+            if not embeddings or len(embeddings) != len(missing):
+                return None
+            self.store_embeddings(document_type, missing, embeddings, found)
+
+        embeddings = [found[text_hash] for text_hash in text_hashes]
+        return embeddings[0] if single_input else embeddings
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        single_input = isinstance(text, str)
+        texts = [text] if single_input else list(text)
+
+        text_hashes, found, missing = self.split_batch(texts, document_type)
+
+        if missing and self.db_client is not None:
+            if self.cache_model is None:
+                self.cache_model = await EmbeddingCacheModel.create_instance(
+                    db_client=self.db_client
+                )
+            try:
+                cached = await self.cache_model.get_embeddings(
+                    embedding_provider=self.embedding_provider,
+                    embedding_model_id=self.embedding_model_id,
+                    document_type=document_type,
+                    text_hashes=list(missing.keys()),
+                )
+            except Exception as e:
+                self.logger.warning(f"Embedding cache lookup failed: {e}")
+                cached = {}
+            for text_hash, embedding in cached.items():
+                found[text_hash] = embedding
+                self.lru_put(document_type, text_hash, embedding)
+                missing.pop(text_hash, None)
+
+        if missing:
+            embeddings = await self.embedding_client.aembed_text(
+                text=list(missing.values()), document_type=document_type
+            )
+            if not embeddings or len(embeddings) != len(missing):
+                return None
+            new_embeddings = self.store_embeddings(
+                document_type, missing, embeddings, found
+            )
+
+            if self.cache_model is not None:
+                try:
+                    _ = await self.cache_model.insert_embeddings(
+                        embedding_provider=self.embedding_provider,
+                        embedding_model_id=self.embedding_model_id,
+                        document_type=document_type,
+                        embeddings=new_embeddings,
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Embedding cache write failed: {e}")
+
+        embeddings = [found[text_hash] for text_hash in text_hashes]
+        return embeddings[0] if single_input else embeddings
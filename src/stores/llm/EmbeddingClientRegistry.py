@@ -0,0 +1,91 @@
+from .EmbeddingCacheClient import EmbeddingCacheClient
+from .EmbeddingScheduler import EmbeddingScheduler
+from .LLMProviderFactory import LLMProviderFactory
+
+
+class EmbeddingClientRegistry:
+    """Embedding clients per embedding model.
+
+    The configured EMBEDDING_MODEL_ID is the default. A project whose live
+    collection was built with another model (see the re-index job) is served
+    by a client for that model, so its queries and new chunks are embedded
+    in the same space as the stored vectors. Only the default and the models
+    in EMBEDDING_ALLOWED_MODELS, at their configured sizes, get a client.
+    """
+
+    def __init__(self, config, llm_provider_factory: LLMProviderFactory, db_client=None):
+        self.config = config
+        self.llm_provider_factory = llm_provider_factory
+        self.db_client = db_client
+        self.clients = {}
+        self.allowed_models = {
+            **config.EMBEDDING_ALLOWED_MODELS,
+            config.EMBEDDING_MODEL_ID: config.EMBEDDING_MODEL_SIZE,
+        }
+
+        self.default = self.build(
+            embedding_model_id=config.EMBEDDING_MODEL_ID,
+            embedding_size=config.EMBEDDING_MODEL_SIZE,
+        )
+        self.clients[(config.EMBEDDING_MODEL_ID, config.EMBEDDING_MODEL_SIZE)] = self.default
+
+    def build(
+        self,
+        embedding_model_id: str,
+        embedding_size: int,
+        requests_per_minute: int = None,
+        tokens_per_minute: int = None,
+    ):
+        """Provider client wrapped in its own scheduler (and the cache when enabled)."""
+        embedding_client = self.llm_provider_factory.create(self.config.EMBEDDING_BACKEND)
+        embedding_client.set_embedding_model(embedding_model_id, embedding_size)
+        embedding_client = EmbeddingScheduler(
+            embedding_client=embedding_client,
+            embedding_provider=self.config.EMBEDDING_BACKEND,
+            requests_per_minute=(
+                self.config.EMBEDDING_RPM_LIMIT
+                if requests_per_minute is None
+                else requests_per_minute
+            ),
+            tokens_per_minute=(
+                self.config.EMBEDDING_TPM_LIMIT
+                if tokens_per_minute is None
+                else tokens_per_minute
+            ),
+            max_batch_size=self.config.EMBEDDING_MAX_BATCH_SIZE,
+            max_batch_tokens=self.config.EMBEDDING_MAX_BATCH_TOKENS,
+            max_concurrent_requests=self.config.EMBEDDING_MAX_CONCURRENT_REQUESTS,
+            max_retries=self.config.EMBEDDING_MAX_RETRIES,
+        )
+        # the cache sits in front so only misses reach the scheduler
+        if self.config.EMBEDDING_CACHE_ENABLED:
+            embedding_client = EmbeddingCacheClient(
+                embedding_client=embedding_client,
+                embedding_provider=self.config.EMBEDDING_BACKEND,
+                db_client=self.db_client,
+                lru_size=self.config.EMBEDDING_CACHE_LRU_SIZE,
+            )
+        return embedding_client
+
+    def is_allowed(self, embedding_model_id: str, embedding_size: int) -> bool:
+        return self.allowed_models.get(embedding_model_id) == embedding_size
+
+    def get(self, embedding_model_id: str = None, embedding_size: int = None):
+        if embedding_model_id is None:
+            return self.default
+
+        key = (embedding_model_id, embedding_size)
+        if key not in self.clients:
+            if not self.is_allowed(embedding_model_id, embedding_size):
+                raise ValueError(
+                    f"Embedding model {embedding_model_id} ({embedding_size}) is not allowed"
+                )
+            self.clients[key] = self.build(embedding_model_id, embedding_size)
+        return self.clients[key]
+
+    def get_for_project(self, project):
+        vector_collection = project.project_vector_collection or {}
+        return self.get(
+            embedding_model_id=vector_collection.get("embedding_model_id"),
+            embedding_size=vector_collection.get("embedding_size"),
+        )
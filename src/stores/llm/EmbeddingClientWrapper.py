@@ -0,0 +1,38 @@
+from .LLMInterface import LLMInterface
+
+
+class EmbeddingClientWrapper(LLMInterface):
+    """Base for clients that wrap another LLM client to change how it embeds.
+
+    Everything but embedding is delegated to the wrapped client; subclasses
+    implement embed_text and aembed_text.
+    """
+
+    def __init__(self, embedding_client: LLMInterface):
+        self.embedding_client = embedding_client
+
+    def __getattr__(self, name):
+        # not set yet while unpickling or during __init__
+        if name == "embedding_client":
+            raise AttributeError(name)
+        return getattr(self.embedding_client, name)
+
+    @property
+    def embedding_model_id(self):
+        return self.embedding_client.embedding_model_id
+
+    @property
+    def embedding_size(self):
+        return self.embedding_client.embedding_size
+
+    def set_generation_model(self, model_id: str):
+        return self.embedding_client.set_generation_model(model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        return self.embedding_client.set_embedding_model(model_id, embedding_size)
+
+    def generate_text(self, *args, **kwargs):
+        return self.embedding_client.generate_text(*args, **kwargs)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.embedding_client.construct_prompt(prompt, role)
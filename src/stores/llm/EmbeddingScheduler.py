@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import random
+import time
+from typing import List, Union
+
+from utils.metrics import (
+    EMBEDDING_BATCH_TOKENS,
+    EMBEDDING_LATENCY,
+    EMBEDDING_QUEUE_DEPTH,
+    EMBEDDING_REQUESTS,
+    EMBEDDING_TEXTS,
+    EMBEDDING_TOKENS,
+)
+
+from .EmbeddingClientWrapper import EmbeddingClientWrapper
+from .LLMInterface import LLMInterface
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` units per minute with bursts up to one minute's worth.
+
+    A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1):
+        if self.rate_per_second <= 0:
+            return
+
+        # a request larger than the bucket would wait forever; let it drain the bucket
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.rate_per_second,
+                )
+                self.updated_at = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate_per_second)
+
+    def drain(self):
+        # the provider says we are over the limit, whatever our own count says
+        self.tokens = 0.0
+        self.updated_at = time.monotonic()
+
+
+class EmbeddingScheduler(EmbeddingClientWrapper):
+    """Sends a provider's embedding requests within its rate limits.
+
+    Texts are packed into requests by estimated token count, requests run
+    concurrently up to max_concurrent_requests, and requests-per-minute and
+    tokens-per-minute buckets gate every call. Transient failures (rate
+    limits, timeouts, 5xx) are retried with exponential backoff; on rate-limit
+    errors the token budget per request is halved and then grows back as
+    requests succeed. Other errors reach the caller.
+    """
+
+    def __init__(
+        self,
+        embedding_client: LLMInterface,
+        embedding_provider: str,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_batch_size: int = 100,
+        max_batch_tokens: int = 20000,
+        max_concurrent_requests: int = 4,
+        max_retries: int = 5,
+    ):
+        super().__init__(embedding_client)
+        self.embedding_provider = embedding_provider
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.batch_tokens = max_batch_tokens
+        self.max_retries = max_retries
+
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+        self.logger = logging.getLogger("uvicorn")
+        EMBEDDING_BATCH_TOKENS.labels(provider=embedding_provider).set(self.batch_tokens)
+
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        # sync callers (langchain helpers) bypass the scheduler
+        return self.embedding_client.embed_text(text=text, document_type=document_type)
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # roughly 4 characters per token for the providers we use
+        return len(text) // 4 + 1
+
+    def pack_batches(self, texts: List[str]) -> List[List[int]]:
+        """Group text indexes into requests bounded by size and token budget."""
+        batches = []
+        batch, batch_tokens = [], 0
+        for idx, text in enumerate(texts):
+            tokens = self.estimate_tokens(text)
+            if batch and (
+                len(batch) >= self.max_batch_size
+                or batch_tokens + tokens > self.batch_tokens
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(idx)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def is_rate_limited(error: Exception) -> bool:
+        status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if status_code == 429:
+            return True
+        message = str(error).lower()
+        return "429" in message or "rate limit" in message or "resource_exhausted" in message
+
+    @classmethod
+    def is_transient(cls, error: Exception) -> bool:
+        """Rate limits, timeouts and server errors; retrying anything else won't help."""
+        if cls.is_rate_limited(error):
+            return True
+        if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+            return True
+        if "timeout" in type(error).__name__.lower():
+            return True
+
+        status_code = getattr(error, "status_code", None) or getattr(error, "code", None)
+        if status_code is None:
+            status_code = getattr(getattr(error, "response", None), "status_code", None)
+        return isinstance(status_code, int) and 500 <= status_code < 600
+
+    @staticmethod
+    def get_retry_after(error: Exception):
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
+    def shrink_batch_tokens(self):
+        self.batch_tokens = max(self.batch_tokens // 2, 1)
+        EMBEDDING_BATCH_TOKENS.labels(provider=self.embedding_provider).set(self.batch_tokens)
+
+    def grow_batch_tokens(self):
+        if self.batch_tokens < self.max_batch_tokens:
+            self.batch_tokens = min(
+                self.max_batch_tokens, self.batch_tokens + self.max_batch_tokens // 10
+            )
+            EMBEDDING_BATCH_TOKENS.labels(provider=self.embedding_provider).set(self.batch_tokens)
+
+    async def run_batch(self, texts: List[str], document_type: str, attempt: int = 0):
+        tokens = sum(self.estimate_tokens(text) for text in texts)
+
+        await self.request_bucket.acquire(1)
+        await self.token_bucket.acquire(tokens)
+
+        try:
+            async with self.semaphore:
+                started_at = time.monotonic()
+                embeddings = await self.embedding_client.aembed_text(
+                    text=texts, document_type=document_type
+                )
+                EMBEDDING_LATENCY.labels(provider=self.embedding_provider).observe(
+                    time.monotonic() - started_at
+                )
+            if not embeddings or len(embeddings) != len(texts):
+                raise RuntimeError("Embedding provider returned no vectors")
+        except Exception as e:
+            EMBEDDING_REQUESTS.labels(provider=self.embedding_provider, status="error").inc()
+            if not self.is_transient(e):
+                self.logger.error(f"Embedding request failed: {e}")
+                raise
+            if attempt >= self.max_retries:
+                self.logger.error(f"Embedding request failed after {attempt + 1} attempts: {e}")
+                raise
+
+            rate_limited = self.is_rate_limited(e)
+            if rate_limited:
+                self.shrink_batch_tokens()
+                self.request_bucket.drain()
+                self.token_bucket.drain()
+
+            delay = self.get_retry_after(e) or min(2 ** attempt, 60) * (1 + random.random())
+            self.logger.warning(
+                f"Embedding request failed (attempt {attempt + 1}), retrying in {delay:.1f}s: {e}"
+            )
+            await asyncio.sleep(delay)
+
+            # a rate-limited batch over the reduced budget is retried in halves
+            if rate_limited and len(texts) > 1 and tokens > self.batch_tokens:
+                middle = len(texts) // 2
+                halves = await asyncio.gather(
+                    self.run_batch(texts[:middle], document_type, attempt + 1),
+                    self.run_batch(texts[middle:], document_type, attempt + 1),
+                )
+                return halves[0] + halves[1]
+            return await self.run_batch(texts, document_type, attempt + 1)
+
+        EMBEDDING_REQUESTS.labels(provider=self.embedding_provider, status="ok").inc()
+        EMBEDDING_TEXTS.labels(provider=self.embedding_provider).inc(len(texts))
+        EMBEDDING_TOKENS.labels(provider=self.embedding_provider).inc(tokens)
+        self.grow_batch_tokens()
+        return list(embeddings)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        single_input = isinstance(text, str)
+        texts = [text] if single_input else list(text)
+        if not texts:
+            return []
+
+        queue_depth = EMBEDDING_QUEUE_DEPTH.labels(provider=self.embedding_provider)
+
+        async def run_queued_batch(batch: List[int]):
+            try:
+                return await self.run_batch([texts[idx] for idx in batch], document_type)
+            finally:
+                queue_depth.dec(len(batch))
+
+        batches = self.pack_batches(texts)
+        queue_depth.inc(len(texts))
+        tasks = [asyncio.ensure_future(run_queued_batch(batch)) for batch in batches]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        embeddings = [None] * len(texts)
+        for batch, batch_embeddings in zip(batches, results):
+            for idx, embedding in zip(batch, batch_embeddings):
+                embeddings[idx] = embedding
+
+        return embeddings[0] if single_input else embeddings
@@ -1,7 +1,14 @@
+import asyncio
+import functools
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 
 class LLMInterface(ABC):
+    # threads shared by providers whose SDK has no async embedding call
+    EMBEDDING_OFFLOAD_MAX_WORKERS = 8
+    embedding_executor: ThreadPoolExecutor = None
+
     @abstractmethod
     def set_generation_model(self, model_id: str):
         pass
@@ -25,6 +32,21 @@ class LLMInterface(ABC):
     def embed_text(self, document_type: str, text: str):
         pass
 
+    async def aembed_text(self, text, document_type: str = None):
+        """Async embed_text. Providers with an async SDK client override this;
+        the default runs embed_text on a bounded thread pool so the event
+        loop keeps serving other requests meanwhile."""
+        if LLMInterface.embedding_executor is None:
+            LLMInterface.embedding_executor = ThreadPoolExecutor(
+                max_workers=self.EMBEDDING_OFFLOAD_MAX_WORKERS,
+                thread_name_prefix="embedding",
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            LLMInterface.embedding_executor,
+            functools.partial(self.embed_text, text=text, document_type=document_type),
+        )
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
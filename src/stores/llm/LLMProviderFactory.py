@@ -26,6 +26,7 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                embedding_batch_size=self.config.EMBEDDING_MAX_BATCH_SIZE,
             )
         else:
             raise ValueError(f"Unknown provider type: {provider}")
\ No newline at end of file
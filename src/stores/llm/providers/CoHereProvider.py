@@ -24,6 +24,7 @@ class CoHereProvider(LLMInterface):
         self.embedding_size = None
 
         self.client = cohere.Client(api_key=self.api_key)
+        self.async_client = cohere.AsyncClient(api_key=self.api_key)
 
         self.logger = logging.getLogger(__name__)
 
@@ -84,33 +85,55 @@ class CoHereProvider(LLMInterface):
     def construct_prompt(self, prompt, role):
         return {"role": role, "text": prompt}
     
-    def embed_text(self, document_type, text:Union[str,List[str]]):
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         if not self.client:
             self.logger.error("CoHere client is not initialized.")
             return None
 
-        if isinstance(text, str):
-            text = [text]
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model is not set.")
+            return None
+
+        response = self.client.embed(**self.get_embed_request(text, document_type))
+        return self.parse_embedding_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("CoHere async client is not initialized.")
+            return None
 
         if not self.embedding_model_id:
             self.logger.error("Embedding model is not set.")
             return None
 
-        input_type = CohereEnums.DOCUMENT if document_type == "DOCUMENT" else CohereEnums.QUERY
+        response = await self.async_client.embed(
+            **self.get_embed_request(text, document_type)
+        )
+        return self.parse_embedding_response(response)
 
-        response = self.client.embed(
-            input_type=input_type,
-            model=self.embedding_model_id,
-            embedding_types=['float'],
-            texts=[self.process_text(t) for t in text],
+    def get_embed_request(self, text: Union[str, List[str]], document_type: str):
+        if isinstance(text, str):
+            text = [text]
+
+        input_type = (
+            CohereEnums.DOCUMENT.value
+            if document_type == DocumentTypeEnum.DOCUMENT.value
+            else CohereEnums.QUERY.value
         )
 
+        return {
+            "input_type": input_type,
+            "model": self.embedding_model_id,
+            "embedding_types": ["float"],
+            "texts": [self.process_text(t) for t in text],
+        }
+
+    def parse_embedding_response(self, response):
         if not response or not response.embeddings or not response.embeddings.float:
             self.logger.error("No embedding returned from CoHere API.")
             return None
         return [f for f in response.embeddings.float]
 
-    
     ## the following methods are just to comply with langchain expectations of an embedding model wrapper
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         return self.embed_text(texts, document_type=DocumentTypeEnum.DOCUMENT.value)
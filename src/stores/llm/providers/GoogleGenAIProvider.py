@@ -15,11 +15,14 @@ class GoogleGenAIProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
+        embedding_batch_size: int = 100,
     ):
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
         self.default_generation_max_output_tokens = default_generation_max_output_tokens
         self.default_generation_temperature = default_generation_temperature
+        # Google GenAI accepts at most 100 texts per embed_content call
+        self.embedding_batch_size = min(embedding_batch_size, 100)
 
         self.generation_model_id = None
 
@@ -115,39 +118,79 @@ class GoogleGenAIProvider(LLMInterface):
         if single_input:
             text = [text]
 
-        # Google GenAI batch limit is 100 requests
-        BATCH_SIZE = 100
         all_embeddings = []
-        
-        # Process in batches of 100
-        for i in range(0, len(text), BATCH_SIZE):
-            batch_text = text[i:i + BATCH_SIZE]
-            
+
+        # Process in batches of embedding_batch_size
+        for i in range(0, len(text), self.embedding_batch_size):
+            batch_text = text[i:i + self.embedding_batch_size]
+
             response = self.client.models.embed_content(
-                model=self.embedding_model_id, 
+                model=self.embedding_model_id,
                 contents=[self.process_text(t) for t in batch_text]
             )
 
-            if not response or not response.embeddings:
-                self.logger.error(f"No embedding returned from GoogleGenAI for batch {i//BATCH_SIZE + 1}.")
+            batch_embeddings = self.parse_embedding_response(
+                response, batch_no=i // self.embedding_batch_size + 1
+            )
+            if batch_embeddings is None:
                 return None
+            all_embeddings.extend(batch_embeddings)
 
-            # Extract embeddings for this batch
-            for emb in response.embeddings:
-                if not emb or not emb.values:
-                    self.logger.error("Invalid embedding in response.")
-                    return None
-                all_embeddings.append(emb.values)
+        # Return single embedding for single input, list for multiple inputs
+        return all_embeddings[0] if single_input else all_embeddings
 
-                # Validate embedding size
-                if len(emb.values) != self.embedding_size:
-                    self.logger.warning(
-                        f"Expected embedding size {self.embedding_size}, but got {len(emb.values)}"
-                    )
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.client:
+            self.logger.error("GoogleGenAI client is not initialized.")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model is not set.")
+            return None
+
+        single_input = isinstance(text, str)
+        if single_input:
+            text = [text]
+
+        all_embeddings = []
+
+        for i in range(0, len(text), self.embedding_batch_size):
+            batch_text = text[i:i + self.embedding_batch_size]
+
+            # client.aio is the native async surface of the same client
+            response = await self.client.aio.models.embed_content(
+                model=self.embedding_model_id,
+                contents=[self.process_text(t) for t in batch_text]
+            )
+
+            batch_embeddings = self.parse_embedding_response(
+                response, batch_no=i // self.embedding_batch_size + 1
+            )
+            if batch_embeddings is None:
+                return None
+            all_embeddings.extend(batch_embeddings)
 
-        # Return single embedding for single input, list for multiple inputs
         return all_embeddings[0] if single_input else all_embeddings
 
+    def parse_embedding_response(self, response, batch_no: int = 1):
+        if not response or not response.embeddings:
+            self.logger.error(f"No embedding returned from GoogleGenAI for batch {batch_no}.")
+            return None
+
+        embeddings = []
+        for emb in response.embeddings:
+            if not emb or not emb.values:
+                self.logger.error("Invalid embedding in response.")
+                return None
+            embeddings.append(emb.values)
+
+            # Validate embedding size
+            if len(emb.values) != self.embedding_size:
+                self.logger.warning(
+                    f"Expected embedding size {self.embedding_size}, but got {len(emb.values)}"
+                )
+        return embeddings
+
     ## the following methods are just to comply with langchain expectations of an embedding model wrapper
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
@@ -2,7 +2,7 @@ import logging
 from typing import List, Union
 
 from langchain_openai import ChatOpenAI
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from ..LLMEnums import DocumentTypeEnum, OpenAIEnums
 from ..LLMInterface import LLMInterface
@@ -29,6 +29,7 @@ class OpenAIProvider(LLMInterface):
         self.embedding_size = None
 
         self.client = OpenAI(api_key=self.api_key, base_url=self.api_url)
+        self.async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.api_url)
 
         self.logger = logging.getLogger(__name__)
 
@@ -115,6 +116,24 @@ class OpenAIProvider(LLMInterface):
             input=text, model=self.embedding_model_id
         )
 
+        return self.parse_embedding_response(response)
+
+    async def aembed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("OpenAI async client is not initialized.")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model is not set.")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            input=text, model=self.embedding_model_id
+        )
+
+        return self.parse_embedding_response(response)
+
+    def parse_embedding_response(self, response):
         if (
             not response
             or not response.data
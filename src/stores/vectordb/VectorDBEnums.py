@@ -10,18 +10,33 @@ class DistanceMethodEnums(Enum):
     DOT = "dot"
 
 
+class QdrantQuantizationEnums(Enum):
+    NONE = "none"
+    SCALAR = "scalar"  # int8, 4x smaller
+    PRODUCT = "product"  # product quantization, up to 64x smaller
+
 class PgVectorTableSchemeEnums(Enum):
     ID = "id"
     TEXT = "text"
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    COLLECTION = "collection"  # partition key in the partitioned layout
     _PREFIX = "pgvector"
 
 
 class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_12_ops"
+    DOT = "vector_ip_ops"
+
+class PgVectorStorageModeEnums(Enum):
+    VECTOR = "vector"  # full precision vector(N)
+    HALFVEC = "halfvec"  # half precision halfvec(N), half the index memory
+    BINARY = "binary"  # full vectors, binary-quantized index + exact rerank
+
+class PgVectorLayoutEnums(Enum):
+    TABLE = "table"  # one table (and index) per collection
+    PARTITIONED = "partitioned"  # one list-partitioned table per storage mode and size
 
 class PgVectorIndexTypeEnums(Enum):
     IVFFLAT = "ivfflat"
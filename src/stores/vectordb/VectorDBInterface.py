@@ -59,11 +59,54 @@ class VectorDBInterface(ABC):
         pass
 
 
+    @abstractmethod
+    def delete_many(self, collection_name: str, record_ids: List[int]):
+        pass
+
+
+    @abstractmethod
+    def count_records(self, collection_name: str) -> int:
+        pass
+
+
     @abstractmethod
     def search_by_vector(
         self,
         collection_name: str,
         vector: list,
         limit: int = 10,
+        search_effort: int = None,
     ) -> List[RetrievedDocument]:
-        pass
\ No newline at end of file
+        pass
+
+
+    @abstractmethod
+    def search_many_by_vector(
+        self,
+        collection_name: str,
+        query_vectors: List[list],
+        limit: int = 10,
+        search_effort: int = None,
+    ) -> List[List[RetrievedDocument]]:
+        pass
+
+
+    @abstractmethod
+    def begin_bulk_load(self, collection_name: str):
+        pass
+
+
+    @abstractmethod
+    def end_bulk_load(self, collection_name: str) -> dict:
+        pass
+
+
+    @abstractmethod
+    def evaluate_search_quality(
+        self,
+        collection_name: str,
+        sample_size: int = 20,
+        limit: int = 10,
+        search_effort: int = None,
+    ) -> dict:
+        pass
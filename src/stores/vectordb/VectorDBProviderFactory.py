@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.orm import sessionmaker
 
 from controllers.BaseController import BaseController
@@ -8,10 +9,13 @@ from .VectorDBEnums import VectorDBEnums
 
 class VectorDBProviderFactory:
 
-    def __init__(self, config: dict, db_client: sessionmaker = None):
+    def __init__(
+        self, config: dict, db_client: sessionmaker = None, db_engine: AsyncEngine = None
+    ):
         self.config = config
         self.base_controller = BaseController()
         self.db_client = db_client
+        self.db_engine = db_engine
 
     def create(self, provider: str):
         if provider == VectorDBEnums.QDRANT.value:
@@ -21,12 +25,37 @@ class VectorDBProviderFactory:
             return QdrantDBProvider(
                 db_client=qdrant_db_client,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                url=self.config.VECTOR_DB_URL,
+                api_key=self.config.VECTOR_DB_API_KEY,
+                prefer_grpc=self.config.VECTOR_DB_QDRANT_PREFER_GRPC,
+                grpc_port=self.config.VECTOR_DB_QDRANT_GRPC_PORT,
+                upload_parallelism=self.config.VECTOR_DB_QDRANT_UPLOAD_PARALLELISM,
+                quantization=self.config.VECTOR_DB_QDRANT_QUANTIZATION,
+                quantization_always_ram=self.config.VECTOR_DB_QDRANT_QUANTIZATION_ALWAYS_RAM,
+                product_compression=self.config.VECTOR_DB_QDRANT_PQ_COMPRESSION,
+                on_disk=self.config.VECTOR_DB_QDRANT_ON_DISK,
+                hnsw_m=self.config.VECTOR_DB_QDRANT_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_QDRANT_HNSW_EF_CONSTRUCT,
+                rescore=self.config.VECTOR_DB_QDRANT_RESCORE,
+                oversampling=self.config.VECTOR_DB_QDRANT_OVERSAMPLING,
             )
         if provider == VectorDBEnums.PGVECTOR.value:
             return PGVectorProvider(
                 db_client=self.db_client,
+                db_engine=self.db_engine,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+                max_parallel_maintenance_workers=self.config.VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS,
+                storage_mode=self.config.VECTOR_DB_PGVEC_STORAGE_MODE,
+                rerank_factor=self.config.VECTOR_DB_PGVEC_RERANK_FACTOR,
+                index_type=self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+                hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                hnsw_ef_search=self.config.VECTOR_DB_PGVEC_HNSW_EF_SEARCH,
+                ivfflat_probes=self.config.VECTOR_DB_PGVEC_IVFFLAT_PROBES,
+                ivfflat_recluster_growth=self.config.VECTOR_DB_PGVEC_IVFFLAT_RECLUSTER_GROWTH,
+                layout=self.config.VECTOR_DB_PGVEC_LAYOUT,
             )
         raise ValueError(f"Unsupported VectorDB provider: {provider}") 
@@ -1,15 +1,23 @@
+import asyncio
 import json
 import logging
+import time
 from typing import List,Dict,Any
 
+import asyncpg
+from pgvector.asyncpg import register_vector
 from sqlalchemy.sql import text as sql_text
 import sqlalchemy
+from models.BaseDataModel import BaseDataModel
 from models.db_schemas import RetrievedDocument
+from utils.metrics import INDEX_BUILD_LATENCY
 
 from ..VectorDBEnums import (
     DistanceMethodEnums,
     PgVectorDistanceMethodEnums,
     PgVectorIndexTypeEnums,
+    PgVectorLayoutEnums,
+    PgVectorStorageModeEnums,
     PgVectorTableSchemeEnums,
 )
 from ..VectorDBInterface import VectorDBInterface
@@ -20,16 +28,58 @@ class PGVectorProvider(VectorDBInterface):
     def __init__(
         self,
         db_client,
+        db_engine=None,
         generation_client=None,
         default_vector_size: int = 786,
         distance_method: str = PgVectorDistanceMethodEnums.COSINE.value,
         index_threshold: int = 100,
+        maintenance_work_mem: str = None,
+        max_parallel_maintenance_workers: int = None,
+        storage_mode: str = PgVectorStorageModeEnums.VECTOR.value,
+        rerank_factor: int = 4,
+        index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        hnsw_ef_search: int = 40,
+        ivfflat_probes: int = 10,
+        ivfflat_recluster_growth: float = 2.0,
+        layout: str = PgVectorLayoutEnums.TABLE.value,
     ):
         self.db_client = db_client
+        # engine behind db_client, for connections that outlive a session
+        self.db_engine = db_engine
         self.generation_client = generation_client
         self.default_vector_size = default_vector_size
         self.logger = logging.getLogger("uvicorn")
         self.index_threshold = index_threshold
+        self.maintenance_work_mem = maintenance_work_mem
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
+
+        # collections this worker is bulk loading, each with the connection
+        # holding the shared advisory lock that defers their index build
+        self.bulk_load_connections = {}
+
+        # storage mode for new collections; existing ones keep theirs
+        self.storage_mode = storage_mode
+        # binary mode fetches limit * rerank_factor candidates before rescoring
+        self.rerank_factor = rerank_factor
+        self.collection_configs = {}
+
+        # index settings for new collections, stored in their config
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        # search-time defaults when a request does not pass search_effort
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfflat_probes = ivfflat_probes
+        # IVFFlat centroids go stale as rows are added; rebuild past this growth
+        self.ivfflat_recluster_growth = ivfflat_recluster_growth
+
+        # "partitioned" stores new collections as list partitions of one
+        # table per storage mode and embedding size instead of own tables
+        self.layout = layout
+        # collections known to have a unique chunk_id, the upsert conflict target
+        self.upsert_collections = set()
 
         self.pgvector_table_prefix = PgVectorTableSchemeEnums._PREFIX.value
 
@@ -54,33 +104,65 @@ class PGVectorProvider(VectorDBInterface):
                 else:
                     raise e
 
+    @staticmethod
+    def register_vector_codec(dbapi_connection, connection_record):
+        """Engine "connect" listener: vectors travel in pgvector's binary format.
+
+        Must be registered before the engine opens its first connection, see
+        main.py; the extension is created here on a fresh database because the
+        codec needs its type.
+        """
+        dbapi_connection.run_async(PGVectorProvider.init_vector_connection)
+
+    @staticmethod
+    async def init_vector_connection(connection):
+        has_vector_type = await connection.fetchval(
+            "SELECT to_regtype('vector') IS NOT NULL"
+        )
+        if not has_vector_type:
+            try:
+                await connection.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            except (
+                asyncpg.exceptions.UniqueViolationError,
+                asyncpg.exceptions.DuplicateObjectError,
+            ):
+                # created concurrently by another worker's first connection
+                pass
+        await register_vector(connection)
+
     async def disconnect(self):
         pass
 
     async def is_collection_exists(self, collection_name: str) -> bool:
-        record = None
+        # not cached: another worker may drop the table at any time (reset,
+        # re-index, project delete), and this lookup is cheap
         async with self.db_client() as session:
-            async with session.begin():
-                list_tbl = sql_text(
-                    "SELECT * FROM pg_tables WHERE tablename = :collection_name"
-                )
-                results = await session.execute(
-                    list_tbl, {"collection_name": collection_name}
-                )
-                record = results.scalar_one_or_none()
+            # an index lookup on pg_class instead of scanning the pg_tables view
+            results = await session.execute(
+                sql_text("SELECT to_regclass(:collection_name) IS NOT NULL"),
+                {"collection_name": collection_name},
+            )
+            is_exists = bool(results.scalar_one())
 
-                return record is not None
+        if not is_exists:
+            # a table re-created under this name must be read afresh
+            self.collection_configs.pop(collection_name, None)
+            self.upsert_collections.discard(collection_name)
+        return is_exists
 
     async def list_all_collections(self) -> List:
+        """Names of the tables holding chunk vectors; partitioned parents excluded."""
         records = []
         async with self.db_client() as session:
             async with session.begin():
                 list_tbl = sql_text(
-                    "SELECT tablename FROM pg_tables WHERE tablename LIKE :prefix"
-                )
-                results = await session.execute(
-                    list_tbl, {"prefix": {self.pgvector_table_prefix}}
+                    "SELECT DISTINCT c.relname FROM pg_class c "
+                    "JOIN pg_constraint fk ON fk.conrelid = c.oid "
+                    "WHERE c.relkind = 'r' AND fk.contype = 'f' "
+                    "AND fk.confrelid = 'chunks'::regclass "
+                    "AND c.relnamespace = current_schema()::regnamespace"
                 )
+                results = await session.execute(list_tbl)
                 records = results.scalars().all()
 
         return records
@@ -113,6 +195,7 @@ class PGVectorProvider(VectorDBInterface):
                         "hasindexes": table_data[4],
                     },
                     "record_count": record_count.scalar_one(),
+                    "collection_config": await self.get_collection_config(collection_name),
                 }
             
     async def delete_collection(self, collection_name: str):
@@ -120,10 +203,13 @@ class PGVectorProvider(VectorDBInterface):
         async with self.db_client() as session:
             async with session.begin():
                 if await self.is_collection_exists(collection_name):
+                    # in the partitioned layout this drops just the project's partition
                     self.logger.info(f"Dropping table {collection_name}")
                     drop_sql = sql_text(f"DROP TABLE IF EXISTS {collection_name}")
                     await session.execute(drop_sql)
                     await session.commit()
+                    self.collection_configs.pop(collection_name, None)
+                    self.upsert_collections.discard(collection_name)
                     return True
         return False
 
@@ -136,26 +222,176 @@ class PGVectorProvider(VectorDBInterface):
         is_collection_exists = await self.is_collection_exists(collection_name)
         if not is_collection_exists:
             self.logger.info(
-                f"Creating table {collection_name} with embedding size {embedding_size}"
+                f"Creating table {collection_name} with embedding size {embedding_size} "
+                f"({self.storage_mode} storage)"
             )
+            collection_config = {
+                "storage_mode": self.storage_mode,
+                "embedding_size": embedding_size,
+                "index_type": self.index_type,
+                "index_params": {
+                    "m": self.hnsw_m,
+                    "ef_construction": self.hnsw_ef_construction,
+                },
+            }
+            vector_type = self.get_vector_type(collection_config)
             async with self.db_client() as session:
                 async with session.begin():
-                    create_sql = sql_text(
-                        f"CREATE TABLE {collection_name} ("
-                        f"{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY, "
-                        f"{PgVectorTableSchemeEnums.TEXT.value} text, "
-                        f"{PgVectorTableSchemeEnums.VECTOR.value} vector({embedding_size}), "
-                        f"{PgVectorTableSchemeEnums.CHUNK_ID.value} INTEGER, "
-                        f"{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT '{{}}', "
-                        f"FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)"
-                        ")"
+                    if self.layout == PgVectorLayoutEnums.PARTITIONED.value:
+                        collection_config["layout"] = self.layout
+                        # the parent's index is created empty, before any rows
+                        # exist to train IVFFlat lists on, so it is always HNSW
+                        if self.index_type != PgVectorIndexTypeEnums.HNSW.value:
+                            self.logger.warning(
+                                f"Partitioned layout indexes {collection_name} with hnsw, "
+                                f"not {self.index_type}"
+                            )
+                        collection_config["index_type"] = PgVectorIndexTypeEnums.HNSW.value
+                        collection_config["parent_table"] = await self.create_parent_table(
+                            session, collection_config
+                        )
+                        await self.create_partition(
+                            session, collection_name, collection_config["parent_table"]
+                        )
+                    else:
+                        create_sql = sql_text(
+                            f"CREATE TABLE {collection_name} ("
+                            f"{PgVectorTableSchemeEnums.ID.value} bigserial PRIMARY KEY, "
+                            f"{PgVectorTableSchemeEnums.TEXT.value} text, "
+                            f"{PgVectorTableSchemeEnums.VECTOR.value} {vector_type}({embedding_size}), "
+                            f"{PgVectorTableSchemeEnums.CHUNK_ID.value} INTEGER UNIQUE, "
+                            f"{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT '{{}}', "
+                            f"FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id) ON DELETE CASCADE"
+                            ")"
+                        )
+                        await session.execute(create_sql)
+                    await self.set_collection_config(
+                        session, collection_name, collection_config
                     )
-                    await session.execute(create_sql)
                     await session.commit()
+            self.collection_configs[collection_name] = collection_config
+            self.upsert_collections.add(collection_name)
             return True
 
         return False
 
+    async def create_parent_table(self, session, collection_config: dict) -> str:
+        """Create (once) the partitioned table and vector index shared by all
+        collections with this storage mode and embedding size.
+
+        Postgres still creates a table and an index per partition, so the
+        layout does not cut catalog objects; it keeps their definitions in one
+        place.
+        """
+        embedding_size = int(collection_config["embedding_size"])
+        parent_table = (
+            f"{self.pgvector_table_prefix}_{collection_config['storage_mode']}_{embedding_size}"
+        )
+        vector_type = self.get_vector_type(collection_config)
+        await session.execute(sql_text(
+            f"CREATE TABLE IF NOT EXISTS {parent_table} ("
+            f"{PgVectorTableSchemeEnums.ID.value} bigserial, "
+            f"{PgVectorTableSchemeEnums.TEXT.value} text, "
+            f"{PgVectorTableSchemeEnums.VECTOR.value} {vector_type}({embedding_size}), "
+            f"{PgVectorTableSchemeEnums.CHUNK_ID.value} INTEGER, "
+            f"{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT '{{}}', "
+            f"{PgVectorTableSchemeEnums.COLLECTION.value} text NOT NULL, "
+            f"PRIMARY KEY ({PgVectorTableSchemeEnums.COLLECTION.value}, {PgVectorTableSchemeEnums.ID.value}), "
+            f"FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id) ON DELETE CASCADE"
+            f") PARTITION BY LIST ({PgVectorTableSchemeEnums.COLLECTION.value})"
+        ))
+        # one index definition, cascaded to every partition with the same parameters
+        await session.execute(sql_text(
+            f"CREATE INDEX IF NOT EXISTS {self.default_index_name(parent_table)} "
+            f"ON {parent_table} USING {PgVectorIndexTypeEnums.HNSW.value} "
+            f"({self.get_index_expression(collection_config)}) "
+            f"WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})"
+        ))
+        return parent_table
+
+    async def create_partition(self, session, collection_name: str, parent_table: str):
+        await session.execute(sql_text(
+            f"CREATE TABLE {collection_name} PARTITION OF {parent_table} "
+            f"FOR VALUES IN ('{collection_name}')"
+        ))
+        # rows written to the partition directly (COPY, upserts) get its key
+        await session.execute(sql_text(
+            f"ALTER TABLE {collection_name} ALTER COLUMN "
+            f"{PgVectorTableSchemeEnums.COLLECTION.value} SET DEFAULT '{collection_name}'"
+        ))
+        # the upsert target; unique indexes on the parent must include the key
+        await session.execute(sql_text(
+            f"CREATE UNIQUE INDEX {collection_name}_{PgVectorTableSchemeEnums.CHUNK_ID.value}_key "
+            f"ON {collection_name} ({PgVectorTableSchemeEnums.CHUNK_ID.value})"
+        ))
+
+    def is_partitioned(self, collection_config: dict) -> bool:
+        return collection_config.get("layout") == PgVectorLayoutEnums.PARTITIONED.value
+
+    async def ensure_unique_chunk_ids(self, collection_name: str):
+        """Give collections created before upserts a unique chunk_id.
+
+        Duplicated rows left by retried inserts are removed first, keeping
+        the most recent copy of each chunk.
+        """
+        if collection_name in self.upsert_collections:
+            return
+
+        chunk_id = PgVectorTableSchemeEnums.CHUNK_ID.value
+        row_id = PgVectorTableSchemeEnums.ID.value
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    f"DELETE FROM {collection_name} a USING {collection_name} b "
+                    f"WHERE a.{chunk_id} = b.{chunk_id} AND a.{row_id} < b.{row_id}"
+                ))
+                await session.execute(sql_text(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {collection_name}_{chunk_id}_key "
+                    f"ON {collection_name} ({chunk_id})"
+                ))
+        self.upsert_collections.add(collection_name)
+
+    async def get_collection_config(self, collection_name: str) -> dict:
+        """Storage settings of a collection, read once from its table comment."""
+        if collection_name not in self.collection_configs:
+            async with self.db_client() as session:
+                results = await session.execute(
+                    sql_text("SELECT obj_description(to_regclass(:collection_name), 'pg_class')"),
+                    {"collection_name": collection_name},
+                )
+                comment = results.scalar_one_or_none()
+            try:
+                collection_config = json.loads(comment) if comment else {}
+            except ValueError:
+                collection_config = {}
+            # collections created before storage modes hold full vectors
+            collection_config.setdefault(
+                "storage_mode", PgVectorStorageModeEnums.VECTOR.value
+            )
+            # ... and were indexed with a default HNSW index
+            collection_config.setdefault("index_type", PgVectorIndexTypeEnums.HNSW.value)
+            collection_config.setdefault("index_params", {})
+            # partitions created before this was enforced may record ivfflat
+            if self.is_partitioned(collection_config):
+                collection_config["index_type"] = PgVectorIndexTypeEnums.HNSW.value
+            self.collection_configs[collection_name] = collection_config
+        return self.collection_configs[collection_name]
+
+    async def set_collection_config(
+        self, session, collection_name: str, collection_config: dict
+    ):
+        # the table comment carries the collection's storage and index settings
+        comment = json.dumps(collection_config).replace("'", "''")
+        await session.execute(
+            sql_text(f"COMMENT ON TABLE {collection_name} IS '{comment}'")
+        )
+        self.collection_configs[collection_name] = collection_config
+
+    def get_vector_type(self, collection_config: dict) -> str:
+        if collection_config["storage_mode"] == PgVectorStorageModeEnums.HALFVEC.value:
+            return "halfvec"
+        return "vector"
+
     async def insert_one(
         self,
         collection_name: str,
@@ -177,6 +413,8 @@ class PGVectorProvider(VectorDBInterface):
             return False
 
         metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata else "{}"
+        vector_type = self.get_vector_type(await self.get_collection_config(collection_name))
+        await self.ensure_unique_chunk_ids(collection_name)
 
         try:
             async with self.db_client() as session:
@@ -184,20 +422,20 @@ class PGVectorProvider(VectorDBInterface):
                     insert_sql = sql_text(
                         f"INSERT INTO {collection_name} "
                         f"({PgVectorTableSchemeEnums.TEXT.value}, {PgVectorTableSchemeEnums.VECTOR.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value}, {PgVectorTableSchemeEnums.METADATA.value}) "
-                        f"VALUES (:text, :vector, :chunk_id, :metadata)"
+                        f"VALUES (:text, CAST(:vector AS {vector_type}), :chunk_id, :metadata) "
+                        f"{self.get_upsert_clause()}"
                     )
                     await session.execute(
                         insert_sql,
                         {
                             "text": text,
-                            "vector": "[" + ",".join([str(v) for v in vector]) + "]",
+                            "vector": list(vector),
                             "chunk_id": record_id,
                             "metadata": metadata_json,
                         },
                     )
-                    await self.create_vector_index(
-                        collection_name, index_type=PgVectorIndexTypeEnums.HNSW.value
-                    )
+                    if collection_name not in self.bulk_load_connections:
+                        await self.maintain_vector_index(collection_name)
 
                     await session.commit()
                     return True
@@ -232,54 +470,98 @@ class PGVectorProvider(VectorDBInterface):
             return False
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
+
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+        ]
         try:
+            await self.ensure_unique_chunk_ids(collection_name)
             async with self.db_client() as session:
                 async with session.begin():
+                    # COPY can not upsert, so rows go through a staging table
+                    await session.execute(sql_text(
+                        f"CREATE TEMP TABLE vectors_staging ON COMMIT DROP AS "
+                        f"SELECT {', '.join(columns)} FROM {collection_name} WITH NO DATA"
+                    ))
+                    # binary COPY: one round trip per batch, no float formatting
+                    connection = await BaseDataModel.get_driver_connection(session)
                     for i in range(0, len(texts), batch_size):
-                        batch_texts = texts[i : i + batch_size]
-                        batch_vectors = vectors[i : i + batch_size]
-                        batch_metadata = metadata[i : i + batch_size]
-                        batch_record_ids = record_ids[i : i + batch_size]
-
-                        insert_sql = sql_text(
-                            f"INSERT INTO {collection_name} "
-                            f"({PgVectorTableSchemeEnums.TEXT.value}, {PgVectorTableSchemeEnums.VECTOR.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value}, {PgVectorTableSchemeEnums.METADATA.value}) "
-                            f"VALUES (:text, :vector, :chunk_id, :metadata)"
-                        )
-                        values = []
-                        for text, vector, metadata, record_id in zip(
-                            batch_texts, batch_vectors, batch_metadata, batch_record_ids
-                        ):
-                            metadata_json = (
-                                json.dumps(metadata, ensure_ascii=False)
-                                if metadata
-                                else "{}"
+                        records = [
+                            (
+                                text,
+                                vector,
+                                record_id,
+                                json.dumps(record_metadata, ensure_ascii=False)
+                                if record_metadata
+                                else "{}",
                             )
-                            values.append(
-                                {
-                                    "text": text,
-                                    "vector": "["
-                                    + ",".join([str(v) for v in vector])
-                                    + "]",
-                                    "chunk_id": record_id,
-                                    "metadata": metadata_json,
-                                }
+                            for text, vector, record_metadata, record_id in zip(
+                                texts[i : i + batch_size],
+                                vectors[i : i + batch_size],
+                                metadata[i : i + batch_size],
+                                record_ids[i : i + batch_size],
                             )
-                        await session.execute(insert_sql, values)
+                        ]
+                        await connection.copy_records_to_table(
+                            "vectors_staging", records=records, columns=columns
+                        )
+
+                    # a chunk sent twice in one call would hit ON CONFLICT twice
+                    await session.execute(sql_text(
+                        f"INSERT INTO {collection_name} ({', '.join(columns)}) "
+                        f"SELECT DISTINCT ON ({PgVectorTableSchemeEnums.CHUNK_ID.value}) "
+                        f"{', '.join(columns)} FROM vectors_staging "
+                        f"ORDER BY {PgVectorTableSchemeEnums.CHUNK_ID.value} "
+                        f"{self.get_upsert_clause()}"
+                    ))
 
                     await session.commit()
-                    await self.create_vector_index(
-                        collection_name,
-                        index_type=PgVectorIndexTypeEnums.HNSW.value,
-                    )
+                    if collection_name not in self.bulk_load_connections:
+                        await self.maintain_vector_index(collection_name)
                     return True
 
         except Exception as e:
             self.logger.error(f"Error inserting batch: {e}")
             return False
 
+    def get_upsert_clause(self) -> str:
+        # re-inserting a chunk replaces its row instead of duplicating it
+        return (
+            f"ON CONFLICT ({PgVectorTableSchemeEnums.CHUNK_ID.value}) DO UPDATE SET "
+            f"{PgVectorTableSchemeEnums.TEXT.value} = EXCLUDED.{PgVectorTableSchemeEnums.TEXT.value}, "
+            f"{PgVectorTableSchemeEnums.VECTOR.value} = EXCLUDED.{PgVectorTableSchemeEnums.VECTOR.value}, "
+            f"{PgVectorTableSchemeEnums.METADATA.value} = EXCLUDED.{PgVectorTableSchemeEnums.METADATA.value}"
+        )
+
+    async def count_records(self, collection_name: str) -> int:
+        async with self.db_client() as session:
+            results = await session.execute(
+                sql_text(f"SELECT COUNT(*) FROM {collection_name}")
+            )
+            return results.scalar_one()
+
+    async def delete_many(self, collection_name: str, record_ids: list):
+        if not await self.is_collection_exists(collection_name):
+            return False
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(
+                    f"DELETE FROM {collection_name} "
+                    f"WHERE {PgVectorTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)"
+                )
+                await session.execute(delete_sql, {"record_ids": list(record_ids)})
+        return True
+
     async def search_by_vector(
-        self, collection_name: str, query_vector: list, limit: int = 5
+        self,
+        collection_name: str,
+        query_vector: list,
+        limit: int = 5,
+        search_effort: int = None,
     ) -> List:
         if not await self.is_collection_exists(collection_name):
             self.logger.error(
@@ -287,30 +569,241 @@ class PGVectorProvider(VectorDBInterface):
             )
             return []
 
-        vector = "[" + ",".join([str(v) for v in query_vector]) + "]"
+        try:
+            records = await self.search_records(
+                collection_name, query_vector, limit, search_effort=search_effort
+            )
+        except sqlalchemy.exc.ProgrammingError:
+            # dropped by another worker since the existence check
+            if not await self.is_collection_exists(collection_name):
+                return []
+            raise
+        return [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score,
+            )
+            for record in records
+        ]
+
+    async def search_many_by_vector(
+        self,
+        collection_name: str,
+        query_vectors: List[list],
+        limit: int = 5,
+        search_effort: int = None,
+    ) -> List:
+        """Run several searches concurrently; returns one list per query."""
+        return await asyncio.gather(
+            *[
+                self.search_by_vector(
+                    collection_name, query_vector, limit, search_effort=search_effort
+                )
+                for query_vector in query_vectors
+            ]
+        )
+
+    def get_distance_operator(self) -> str:
+        if self.distance_method == PgVectorDistanceMethodEnums.DOT.value:
+            return "<#>"  # negative inner product
+        return "<=>"  # cosine distance
+
+    def get_score_expression(self, distance_sql: str) -> str:
+        # higher is better, derived from the distance the rows were ordered by
+        if self.distance_method == PgVectorDistanceMethodEnums.DOT.value:
+            return f"-({distance_sql})"
+        return f"1 - ({distance_sql})"
+
+    def get_search_sql(self, collection_name: str, collection_config: dict, exact: bool = False):
+        """Nearest-neighbour query ordered by `vector <op> query` ascending.
+
+        pgvector only answers ORDER BY <distance operator> ASC from the
+        HNSW/IVFFlat index; ordering by a derived score would sort the whole
+        table, so the score is computed on the rows the index returned.
+        """
+        vector_type = self.get_vector_type(collection_config)
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        distance_sql = f"{vector_column} {self.get_distance_operator()} CAST(:vector AS {vector_type})"
+
+        if collection_config["storage_mode"] == PgVectorStorageModeEnums.BINARY.value and not exact:
+            bits = f"bit({int(collection_config['embedding_size'])})"
+            # candidates come from the binary index, then get rescored on full vectors
+            return sql_text(
+                f"SELECT {PgVectorTableSchemeEnums.ID.value}, text, "
+                f"{self.get_score_expression(distance_sql)} as score "
+                f"FROM ("
+                f"SELECT {PgVectorTableSchemeEnums.ID.value}, "
+                f"{PgVectorTableSchemeEnums.TEXT.value} as text, {vector_column} "
+                f"FROM {collection_name} "
+                f"ORDER BY binary_quantize({vector_column})::{bits} "
+                f"<~> binary_quantize(CAST(:vector AS vector))::{bits} "
+                f"LIMIT :candidates"
+                f") candidates "
+                f"ORDER BY {distance_sql} "
+                f"LIMIT :limit"
+            )
+
+        return sql_text(
+            f"SELECT {PgVectorTableSchemeEnums.ID.value}, "
+            f"{PgVectorTableSchemeEnums.TEXT.value} as text, "
+            f"{self.get_score_expression(distance_sql)} as score "
+            f"FROM {collection_name} "
+            f"ORDER BY {distance_sql} "
+            f"LIMIT :limit"
+        )
+
+    async def search_records(
+        self,
+        collection_name: str,
+        query_vector: list,
+        limit: int,
+        exact: bool = False,
+        search_effort: int = None,
+    ):
+        """Return (id, text, score) rows for the nearest vectors.
+
+        Binary collections generate limit * rerank_factor candidates through
+        the quantized index and rescore them on the full vectors. With exact,
+        index scans are disabled to get the ground truth. search_effort trades
+        latency for recall: hnsw.ef_search or ivfflat.probes for this query.
+        """
+        collection_config = await self.get_collection_config(collection_name)
+        search_sql = self.get_search_sql(collection_name, collection_config, exact=exact)
+
         async with self.db_client() as session:
             async with session.begin():
-
-                search_sql = sql_text(
-                    f"SELECT {PgVectorTableSchemeEnums.ID.value}, "
-                    f"{PgVectorTableSchemeEnums.TEXT.value} as text, "
-                    f"1-({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) as score "
-                    f"FROM {collection_name} "
-                    f"ORDER BY score DESC "
-                    f"LIMIT {limit}"
+                if exact:
+                    await session.execute(sql_text("SET LOCAL enable_indexscan = off"))
+                else:
+                    await self.set_search_effort(
+                        session,
+                        collection_config,
+                        search_effort=search_effort,
+                        candidates=limit * self.rerank_factor
+                        if collection_config["storage_mode"] == PgVectorStorageModeEnums.BINARY.value
+                        else limit,
+                    )
+                results = await session.execute(
+                    search_sql,
+                    {
+                        "vector": list(query_vector),
+                        "limit": limit,
+                        "candidates": limit * self.rerank_factor,
+                    },
                 )
+                return results.fetchall()
 
+    async def explain_search(
+        self,
+        collection_name: str,
+        query_vector: list,
+        limit: int,
+        search_effort: int = None,
+    ) -> list:
+        """EXPLAIN lines of the search query, planned with the same settings."""
+        collection_config = await self.get_collection_config(collection_name)
+        search_sql = self.get_search_sql(collection_name, collection_config)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.set_search_effort(
+                    session,
+                    collection_config,
+                    search_effort=search_effort,
+                    candidates=limit * self.rerank_factor
+                    if collection_config["storage_mode"] == PgVectorStorageModeEnums.BINARY.value
+                    else limit,
+                )
                 results = await session.execute(
-                    search_sql, {"vector": vector, "limit": limit}
+                    sql_text(f"EXPLAIN {search_sql.text}"),
+                    {
+                        "vector": list(query_vector),
+                        "limit": limit,
+                        "candidates": limit * self.rerank_factor,
+                    },
                 )
-                records = results.fetchall()
-                return [
-                    RetrievedDocument(
-                        text=record.text,
-                        score=record.score,
-                    )
-                    for record in records
-                ]
+                return [row[0] for row in results.fetchall()]
+
+    async def set_search_effort(
+        self, session, collection_config: dict, search_effort: int = None, candidates: int = 0
+    ):
+        """SET LOCAL the search parameter of the collection's index type."""
+        if collection_config["index_type"] == PgVectorIndexTypeEnums.IVFFLAT.value:
+            probes = max(int(search_effort or self.ivfflat_probes), 1)
+            await session.execute(sql_text(f"SET LOCAL ivfflat.probes = {probes}"))
+        else:
+            # ef_search bounds how many rows the index scan returns (1000 at most)
+            ef_search = min(max(int(search_effort or self.hnsw_ef_search), candidates), 1000)
+            await session.execute(sql_text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+    async def evaluate_search_quality(
+        self,
+        collection_name: str,
+        sample_size: int = 20,
+        limit: int = 10,
+        search_effort: int = None,
+    ) -> dict:
+        """Recall@limit and latency of the collection's search against exact search.
+
+        Stored vectors are used as queries. For halfvec collections the
+        baseline is exact search over the half precision vectors.
+        """
+        if not await self.is_collection_exists(collection_name):
+            return None
+
+        collection_config = await self.get_collection_config(collection_name)
+        async with self.db_client() as session:
+            results = await session.execute(sql_text(
+                f"SELECT {PgVectorTableSchemeEnums.VECTOR.value} FROM {collection_name} "
+                f"ORDER BY random() LIMIT :sample_size"
+            ), {"sample_size": sample_size})
+            # numpy arrays for vector columns, HalfVector for halfvec ones
+            sample_vectors = [
+                vector.tolist() if hasattr(vector, "tolist") else vector.to_list()
+                for vector in results.scalars().all()
+            ]
+
+        # a sequential scan here means the query does not reach the ANN index
+        index_scan = None
+        if sample_vectors:
+            plan = await self.explain_search(
+                collection_name, sample_vectors[0], limit, search_effort=search_effort
+            )
+            index_scan = any("Index Scan" in line for line in plan)
+
+        recalls, search_latencies, exact_latencies = [], [], []
+        for query_vector in sample_vectors:
+            started_at = time.monotonic()
+            records = await self.search_records(
+                collection_name, query_vector, limit, search_effort=search_effort
+            )
+            search_latencies.append(time.monotonic() - started_at)
+
+            started_at = time.monotonic()
+            exact_records = await self.search_records(
+                collection_name, query_vector, limit, exact=True
+            )
+            exact_latencies.append(time.monotonic() - started_at)
+
+            exact_ids = {record.id for record in exact_records}
+            if exact_ids:
+                found = sum(1 for record in records if record.id in exact_ids)
+                recalls.append(found / len(exact_ids))
+
+        def mean_ms(values):
+            return round(1000 * sum(values) / len(values), 2) if values else None
+
+        return {
+            "storage_mode": collection_config["storage_mode"],
+            "index_type": collection_config["index_type"],
+            "index_scan": index_scan,
+            "search_effort": search_effort,
+            "sample_size": len(sample_vectors),
+            "limit": limit,
+            "recall": round(sum(recalls) / len(recalls), 4) if recalls else None,
+            "search_latency_ms": mean_ms(search_latencies),
+            "exact_latency_ms": mean_ms(exact_latencies),
+        }
 
     async def is_index_exists(self, collection_name: str) -> bool:
         index_name = self.default_index_name(collection_name)
@@ -330,15 +823,78 @@ class PGVectorProvider(VectorDBInterface):
                 record = results.scalar_one_or_none()
                 return bool(record)
 
+    @staticmethod
+    def get_ivfflat_lists(record_count: int) -> int:
+        # pgvector's guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond
+        if record_count <= 1_000_000:
+            return max(record_count // 1000, 1)
+        return int(record_count ** 0.5)
+
+    async def get_estimated_record_count(self, collection_name: str) -> int:
+        # planner statistics instead of a COUNT(*) scan on every insert
+        async with self.db_client() as session:
+            results = await session.execute(
+                sql_text(
+                    "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:collection_name)"
+                ),
+                {"collection_name": collection_name},
+            )
+            return results.scalar_one_or_none() or 0
+
+    def get_index_expression(self, collection_config: dict) -> str:
+        storage_mode = collection_config["storage_mode"]
+        if storage_mode == PgVectorStorageModeEnums.BINARY.value:
+            bits = f"bit({int(collection_config['embedding_size'])})"
+            return (
+                f"(binary_quantize({PgVectorTableSchemeEnums.VECTOR.value})::{bits}) "
+                f"bit_hamming_ops"
+            )
+        if storage_mode == PgVectorStorageModeEnums.HALFVEC.value:
+            return (
+                f"{PgVectorTableSchemeEnums.VECTOR.value} "
+                f"{self.distance_method.replace('vector_', 'halfvec_', 1)}"
+            )
+        return f"{PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method}"
+
+    @staticmethod
+    def get_index_lock_key(collection_name: str) -> str:
+        # hashed with hashtext() into the advisory lock id of the collection's index
+        return f"{collection_name}_vector_idx"
+
     async def create_vector_index(
-        self, collection_name: str, index_type: str = PgVectorIndexTypeEnums.HNSW.value
+        self, collection_name: str, index_type: str = None, replace: bool = False
     ) -> bool:
+        """Build the collection's vector index if it has enough rows.
+
+        Index type and HNSW parameters come from the collection config unless
+        index_type is given; IVFFlat lists are derived from the row count,
+        which is recorded so the index can be re-clustered as rows grow.
+        With replace, the new index is built next to the live one and swapped
+        in, so searches keep using the old index during the build. Nothing is
+        built while any worker bulk loads the collection (see begin_bulk_load).
+        Partitions use the index of their parent table instead.
+        """
+        if self.is_partitioned(await self.get_collection_config(collection_name)):
+            return False
         is_index_exists = await self.is_index_exists(collection_name)
-        if is_index_exists:
+        if is_index_exists and not replace:
             self.logger.info(f"Index already exists for collection {collection_name}")
             return False
         async with self.db_client() as session:
             async with session.begin():
+                # fails while a bulk load holds the shared lock, and keeps two
+                # workers from building the same index
+                results = await session.execute(
+                    sql_text("SELECT pg_try_advisory_xact_lock(hashtext(:lock_key))"),
+                    {"lock_key": self.get_index_lock_key(collection_name)},
+                )
+                if not results.scalar_one():
+                    self.logger.info(
+                        f"Index build of {collection_name} deferred: bulk load or build in progress"
+                    )
+                    return False
+
                 count_sql = sql_text(f"SELECT COUNT(*) FROM {collection_name}")
                 results = await session.execute(count_sql)
                 record_count = results.scalar_one()
@@ -351,29 +907,152 @@ class PGVectorProvider(VectorDBInterface):
                     f"START Creating index for collection {collection_name}"
                 )
                 index_name = self.default_index_name(collection_name)
+                build_index_name = f"{index_name}_new" if is_index_exists else index_name
+                # the stored config may be stale if another worker re-clustered
+                self.collection_configs.pop(collection_name, None)
+                collection_config = await self.get_collection_config(collection_name)
+                index_type = index_type or collection_config["index_type"]
+                index_expression = self.get_index_expression(collection_config)
+
+                if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+                    index_params = {"lists": self.get_ivfflat_lists(record_count)}
+                else:
+                    index_params = {
+                        "m": int(collection_config["index_params"].get("m", self.hnsw_m)),
+                        "ef_construction": int(
+                            collection_config["index_params"].get(
+                                "ef_construction", self.hnsw_ef_construction
+                            )
+                        ),
+                    }
+                with_clause = ", ".join(f"{key} = {value}" for key, value in index_params.items())
+
                 create_index_sql = sql_text(
-                    f"CREATE INDEX {index_name} ON {collection_name} "
-                    f"USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})"
+                    f"CREATE INDEX {build_index_name} ON {collection_name} "
+                    f"USING {index_type} ({index_expression}) WITH ({with_clause})"
                 )
-                print(create_index_sql)
+                # HNSW builds far faster when the graph fits in maintenance_work_mem
+                if self.maintenance_work_mem:
+                    await session.execute(sql_text(
+                        f"SET LOCAL maintenance_work_mem = '{self.maintenance_work_mem}'"
+                    ))
+                if self.max_parallel_maintenance_workers is not None:
+                    await session.execute(sql_text(
+                        "SET LOCAL max_parallel_maintenance_workers = "
+                        f"{int(self.max_parallel_maintenance_workers)}"
+                    ))
+                started_at = time.monotonic()
                 await session.execute(create_index_sql)
+                INDEX_BUILD_LATENCY.labels(
+                    collection=collection_name, index_type=index_type
+                ).observe(time.monotonic() - started_at)
+                if build_index_name != index_name:
+                    # the swap only holds the table lock for the drop and rename
+                    await session.execute(sql_text(f"DROP INDEX IF EXISTS {index_name}"))
+                    await session.execute(sql_text(
+                        f"ALTER INDEX {build_index_name} RENAME TO {index_name}"
+                    ))
+                await self.set_collection_config(
+                    session,
+                    collection_name,
+                    {
+                        **collection_config,
+                        "index_type": index_type,
+                        "index_params": {**collection_config["index_params"], **index_params},
+                        "indexed_record_count": record_count,
+                    },
+                )
                 await session.commit()
 
-                self.logger.info(f"END Creating index for collection {collection_name}")
+                self.logger.info(
+                    f"END Creating {index_type} index ({with_clause}) for collection {collection_name}"
+                )
                 return True
 
+    async def maintain_vector_index(self, collection_name: str) -> bool:
+        """Create the index once there are enough rows, re-cluster IVFFlat as rows grow."""
+        collection_config = await self.get_collection_config(collection_name)
+        if self.is_partitioned(collection_config):
+            return False
+
+        if not await self.is_index_exists(collection_name):
+            return await self.create_vector_index(collection_name)
+
+        if collection_config["index_type"] != PgVectorIndexTypeEnums.IVFFLAT.value:
+            return False
+
+        estimated_count = await self.get_estimated_record_count(collection_name)
+        indexed_count = collection_config.get("indexed_record_count") or 0
+        if estimated_count < indexed_count * self.ivfflat_recluster_growth:
+            return False
+
+        # another worker may have re-clustered already; re-read the stored config
+        self.collection_configs.pop(collection_name, None)
+        collection_config = await self.get_collection_config(collection_name)
+        indexed_count = collection_config.get("indexed_record_count") or 0
+        if estimated_count < indexed_count * self.ivfflat_recluster_growth:
+            return False
+
+        self.logger.info(
+            f"Re-clustering IVFFlat index of {collection_name}: "
+            f"~{estimated_count} rows, lists built for {indexed_count}"
+        )
+        return await self.reset_vector_index(collection_name)
+
     async def reset_vector_index(
-        self, collection_name: str, index_type: str = PgVectorIndexTypeEnums.HNSW.value
+        self, collection_name: str, index_type: str = None
     ) -> bool:
-        is_index_exists = await self.is_index_exists(collection_name)
-        index_name = self.default_index_name(collection_name)
-        async with self.db_client() as session:
-            async with session.begin():
-                if is_index_exists:
-                    drop_sql = sql_text(f"DROP INDEX IF EXISTS {index_name}")
-                    await session.execute(drop_sql)
-                    await session.commit()
-        return await self.create_vector_index(collection_name, index_type)
+        return await self.create_vector_index(collection_name, index_type, replace=True)
+
+    async def begin_bulk_load(self, collection_name: str):
+        """Defer index builds on the collection until end_bulk_load.
+
+        A shared advisory lock is held on a dedicated connection for the
+        whole load, so no worker builds the index half way through it. An
+        existing index is kept: searches on a live collection stay on the
+        index, and only a collection without one gets the single build at
+        the end.
+        """
+        if self.is_partitioned(await self.get_collection_config(collection_name)):
+            # the partition's index belongs to the parent table
+            return
+        if collection_name in self.bulk_load_connections:
+            return
+
+        connection = await self.db_engine.connect()
+        await connection.execute(
+            sql_text("SELECT pg_advisory_lock_shared(hashtext(:lock_key))"),
+            {"lock_key": self.get_index_lock_key(collection_name)},
+        )
+        # the session-level lock outlives this transaction
+        await connection.commit()
+        self.bulk_load_connections[collection_name] = connection
+
+    async def end_bulk_load(self, collection_name: str) -> dict:
+        """Release the bulk load lock and build the vector index once."""
+        connection = self.bulk_load_connections.pop(collection_name, None)
+        if connection is not None:
+            try:
+                await connection.execute(
+                    sql_text("SELECT pg_advisory_unlock_shared(hashtext(:lock_key))"),
+                    {"lock_key": self.get_index_lock_key(collection_name)},
+                )
+                await connection.commit()
+            finally:
+                await connection.close()
+
+        started_at = time.monotonic()
+        index_created = await self.create_vector_index(collection_name)
+        index_build_seconds = round(time.monotonic() - started_at, 3)
+        if index_created:
+            self.logger.info(
+                f"Built index for collection {collection_name} in {index_build_seconds}s"
+            )
+
+        return {
+            "index_created": index_created,
+            "index_build_seconds": index_build_seconds if index_created else None,
+        }
 
     async def get_chat_history(self, project_id: int) -> List[Dict[str,Any]]:
         chat_history = []
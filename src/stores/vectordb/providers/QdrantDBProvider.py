@@ -1,20 +1,64 @@
+import asyncio
 import logging
+import time
 from typing import List
 
-from qdrant_client import QdrantClient, models
+from qdrant_client import AsyncQdrantClient, models
 
 from models.db_schemas import RetrievedDocument
 
-from ..VectorDBEnums import DistanceMethodEnums
+from ..VectorDBEnums import DistanceMethodEnums, QdrantQuantizationEnums
 from ..VectorDBInterface import VectorDBInterface
 
 
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, db_client: str, distance_method: str,default_vector_size:int=None,index_threshold:int=100):
+    # Qdrant's default optimizers indexing_threshold (kB of vectors per segment),
+    # restored when a collection reports none
+    DEFAULT_INDEXING_THRESHOLD = 20000
+
+    def __init__(
+        self,
+        db_client: str,
+        distance_method: str,
+        default_vector_size: int = None,
+        index_threshold: int = 100,
+        url: str = None,
+        api_key: str = None,
+        prefer_grpc: bool = True,
+        grpc_port: int = 6334,
+        upload_parallelism: int = 4,
+        quantization: str = QdrantQuantizationEnums.NONE.value,
+        quantization_always_ram: bool = True,
+        product_compression: str = "x16",
+        on_disk: bool = False,
+        hnsw_m: int = 16,
+        hnsw_ef_construct: int = 100,
+        rescore: bool = True,
+        oversampling: float = 2.0,
+    ):
 
         self.client = None
+        # local storage path, used when no server url is configured
         self.db_client = db_client
+        self.url = url
+        self.api_key = api_key
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.upload_parallelism = upload_parallelism
+
+        # collection layout, applied when a collection is created
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.product_compression = product_compression
+        self.on_disk = on_disk
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        # search over quantized vectors, then rescore oversampled hits on the originals
+        self.rescore = rescore
+        self.oversampling = oversampling
+        # indexing thresholds of collections being bulk loaded
+        self.bulk_load_thresholds = {}
         self.distance_method = None
         self.default_vector_size = default_vector_size
         if distance_method == DistanceMethodEnums.COSINE.value:
@@ -25,22 +69,63 @@ class QdrantDBProvider(VectorDBInterface):
         self.logger = logging.getLogger('uvicorn')
 
     async def connect(self):
-        self.client = QdrantClient(path=self.db_client)
+        if self.url:
+            # server mode can be shared by every uvicorn worker
+            self.client = AsyncQdrantClient(
+                url=self.url,
+                api_key=self.api_key,
+                prefer_grpc=self.prefer_grpc,
+                grpc_port=self.grpc_port,
+            )
+        else:
+            self.client = AsyncQdrantClient(path=self.db_client)
+
+    def get_quantization_config(self):
+        if self.quantization == QdrantQuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+        if self.quantization == QdrantQuantizationEnums.PRODUCT.value:
+            return models.ProductQuantization(
+                product=models.ProductQuantizationConfig(
+                    compression=models.CompressionRatio(self.product_compression),
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+        return None
+
+    def get_search_params(self, search_effort: int = None):
+        quantization = None
+        if self.get_quantization_config() is not None:
+            quantization = models.QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling
+            )
+        if quantization is None and search_effort is None:
+            return None
+        # search_effort maps to hnsw_ef, the candidate list size of this search
+        return models.SearchParams(hnsw_ef=search_effort, quantization=quantization)
 
     async def disconnect(self):
+        if self.client is not None:
+            await self.client.close()
         self.client = None
 
     async def is_collection_exists(self, collection_name: str) -> bool:
-        return self.client.has_collection(collection_name=collection_name)
+        return await self.client.collection_exists(collection_name=collection_name)
+
     async def list_all_collections(self) -> List:
-        return  self.client.get_collections()
+        response = await self.client.get_collections()
+        return [collection.name for collection in response.collections]
 
     async def get_collection_info(self, collection_name: str) -> dict:
-        return  self.client.get_collection(collection_name=collection_name)
+        return await self.client.get_collection(collection_name=collection_name)
 
     async def delete_collection(self, collection_name: str):
         if await self.is_collection_exists(collection_name):
-            return  self.client.delete_collection(collection_name=collection_name)
+            return await self.client.delete_collection(collection_name=collection_name)
 
     async def create_collection(
         self, collection_name: str, embedding_size: int, do_reset: bool = False
@@ -48,13 +133,19 @@ class QdrantDBProvider(VectorDBInterface):
         if do_reset:
             _ = await self.delete_collection(collection_name=collection_name)
 
-        if not self.is_collection_exists(collection_name):
+        if not await self.is_collection_exists(collection_name):
             self.logger.info(f"Creating new collection: {collection_name}")
-            _ = self.client.create_collection(
+            _ = await self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
-                    size=embedding_size, distance=self.distance_method
+                    size=embedding_size,
+                    distance=self.distance_method,
+                    on_disk=self.on_disk,
                 ),
+                hnsw_config=models.HnswConfigDiff(
+                    m=self.hnsw_m, ef_construct=self.hnsw_ef_construct
+                ),
+                quantization_config=self.get_quantization_config(),
             )
 
             return True
@@ -77,11 +168,11 @@ class QdrantDBProvider(VectorDBInterface):
             return False
 
         try:
-            _ = self.client.upload_records(
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
+                points=[
+                    models.PointStruct(
+                        id=record_id,
                         vector=vector,
                         payload={"text": text, "metadata": metadata},
                     )
@@ -109,47 +200,200 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = [None] * len(texts)
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
+        semaphore = asyncio.Semaphore(self.upload_parallelism)
 
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={"text": batch_texts[x], "metadata": batch_metadata[x]},
+        async def upsert_batch(i: int):
+            batch_end = i + batch_size
+            batch_points = [
+                models.PointStruct(
+                    id=record_id,
+                    vector=vector,
+                    payload={"text": text, "metadata": record_metadata},
+                )
+                for text, vector, record_metadata, record_id in zip(
+                    texts[i:batch_end],
+                    vectors[i:batch_end],
+                    metadata[i:batch_end],
+                    record_ids[i:batch_end],
                 )
-                for x in range(len(batch_texts))
             ]
-
-            try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name,
-                    records=batch_records,
+            async with semaphore:
+                _ = await self.client.upsert(
+                    collection_name=collection_name, points=batch_points
                 )
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+
+        # up to upload_parallelism batches in flight at once
+        try:
+            await asyncio.gather(
+                *[upsert_batch(i) for i in range(0, len(texts), batch_size)]
+            )
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
 
         return True
 
+    async def delete_many(self, collection_name: str, record_ids: list):
+        if not await self.is_collection_exists(collection_name):
+            return False
+
+        try:
+            _ = await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=list(record_ids)),
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        return True
+
+    async def count_records(self, collection_name: str) -> int:
+        result = await self.client.count(collection_name=collection_name, exact=True)
+        return result.count
+
     async def search_by_vector(
-        self, collection_name: str, query_vector: list, limit: int = 5
+        self,
+        collection_name: str,
+        query_vector: list,
+        limit: int = 5,
+        search_effort: int = None,
     ):
 
-        results = self.client.search(
-            collection_name=collection_name, query_vector=query_vector, limit=limit
+        results = await self.client.query_points(
+            collection_name=collection_name,
+            query=query_vector,
+            limit=limit,
+            search_params=self.get_search_params(search_effort),
         )
 
-        if not results or len(results) == 0:
+        if not results or not results.points:
             return None
 
         return [
             RetrievedDocument(
                 **{"text": hit.payload.get("text", ""), "score": hit.score}
             )
-            for hit in results
+            for hit in results.points
         ]
+
+    async def search_many_by_vector(
+        self,
+        collection_name: str,
+        query_vectors: List[list],
+        limit: int = 5,
+        search_effort: int = None,
+    ):
+        """Run several searches in one batch request; returns one list per query."""
+        if not query_vectors:
+            return []
+
+        responses = await self.client.query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=query_vector,
+                    limit=limit,
+                    with_payload=True,
+                    params=self.get_search_params(search_effort),
+                )
+                for query_vector in query_vectors
+            ],
+        )
+
+        return [
+            [
+                RetrievedDocument(
+                    **{"text": hit.payload.get("text", ""), "score": hit.score}
+                )
+                for hit in response.points
+            ]
+            for response in responses
+        ]
+
+    async def evaluate_search_quality(
+        self,
+        collection_name: str,
+        sample_size: int = 20,
+        limit: int = 10,
+        search_effort: int = None,
+    ) -> dict:
+        """Recall@limit and latency of HNSW search against exact search."""
+        if not await self.is_collection_exists(collection_name):
+            return None
+
+        points, _ = await self.client.scroll(
+            collection_name=collection_name, limit=sample_size, with_vectors=True
+        )
+
+        recalls, search_latencies, exact_latencies = [], [], []
+        for point in points:
+            started_at = time.monotonic()
+            hits = await self.client.query_points(
+                collection_name=collection_name,
+                query=point.vector,
+                limit=limit,
+                search_params=self.get_search_params(search_effort),
+            )
+            search_latencies.append(time.monotonic() - started_at)
+
+            started_at = time.monotonic()
+            exact_hits = await self.client.query_points(
+                collection_name=collection_name,
+                query=point.vector,
+                limit=limit,
+                search_params=models.SearchParams(exact=True),
+            )
+            exact_latencies.append(time.monotonic() - started_at)
+
+            exact_ids = {hit.id for hit in exact_hits.points}
+            if exact_ids:
+                recalls.append(
+                    sum(1 for hit in hits.points if hit.id in exact_ids) / len(exact_ids)
+                )
+
+        def mean_ms(values):
+            return round(1000 * sum(values) / len(values), 2) if values else None
+
+        return {
+            "storage_mode": f"qdrant/{self.quantization}",
+            "search_effort": search_effort,
+            "sample_size": len(points),
+            "limit": limit,
+            "recall": round(sum(recalls) / len(recalls), 4) if recalls else None,
+            "search_latency_ms": mean_ms(search_latencies),
+            "exact_latency_ms": mean_ms(exact_latencies),
+        }
+
+    async def begin_bulk_load(self, collection_name: str):
+        # an indexing threshold of 0 disables HNSW building while points stream in
+        if await self.is_collection_exists(collection_name):
+            collection_info = await self.client.get_collection(
+                collection_name=collection_name
+            )
+            # restored by end_bulk_load, whatever the collection was tuned with;
+            # 0 is left by a load still running elsewhere or one that never ended
+            indexing_threshold = collection_info.config.optimizer_config.indexing_threshold
+            self.bulk_load_thresholds.setdefault(
+                collection_name, indexing_threshold or None
+            )
+            _ = await self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
+            )
+
+    async def end_bulk_load(self, collection_name: str) -> dict:
+        # the optimizer then indexes the loaded segments in the background
+        indexing_threshold = self.bulk_load_thresholds.pop(collection_name, None)
+        if await self.is_collection_exists(collection_name):
+            _ = await self.client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=models.OptimizersConfigDiff(
+                    indexing_threshold=(
+                        self.DEFAULT_INDEXING_THRESHOLD
+                        if indexing_threshold is None
+                        else indexing_threshold
+                    )
+                ),
+            )
+        return {"index_created": False, "index_build_seconds": None}
@@ -0,0 +1,111 @@
+"""Unit tests for ProcessController's token sliding-window splitter."""
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("langchain_community")
+
+from controllers.ProcessController import Document, ProcessController  # noqa: E402
+
+
+@pytest.fixture
+def process_controller():
+    # the splitter needs no project directory or settings
+    return ProcessController.__new__(ProcessController)
+
+
+def split(process_controller, text, chunk_size, overlap_size=0, boundary="none"):
+    chunks = process_controller.process_sliding_window_splitter(
+        pages=[Document(page_content=text, metadata={"page": 0})],
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        boundary=boundary,
+    )
+    return [chunk.page_content.split() for chunk in chunks]
+
+
+def words(count):
+    return [f"w{i}" for i in range(count)]
+
+
+def test_chunks_without_overlap_cover_the_text_once(process_controller):
+    text_words = words(25)
+    chunks = split(process_controller, " ".join(text_words), chunk_size=10)
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert sum(chunks, []) == text_words
+
+
+def test_consecutive_chunks_share_overlap_size_tokens(process_controller):
+    text_words = words(40)
+    chunks = split(process_controller, " ".join(text_words), chunk_size=10, overlap_size=3)
+
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous[-3:] == current[:3]
+    # nothing is lost between the overlaps
+    assert chunks[0] + sum((chunk[3:] for chunk in chunks[1:]), []) == text_words
+
+
+def test_large_overlap_with_boundary_snapping_still_moves_forward(process_controller):
+    # a sentence end every 5 tokens pulls each cut back to half the window;
+    # with overlap near chunk_size the window used to advance one token per chunk
+    text_words = [
+        f"w{i}." if i % 5 == 4 else f"w{i}" for i in range(100)
+    ]
+    chunks = split(
+        process_controller,
+        " ".join(text_words),
+        chunk_size=10,
+        overlap_size=9,
+        boundary="sentence",
+    )
+
+    assert len(chunks) <= len(text_words) // 2
+    assert chunks[-1][-1] == text_words[-1]
+    starts = [text_words.index(chunk[0]) for chunk in chunks]
+    assert starts == sorted(set(starts))
+
+
+def test_sentence_boundary_cuts_after_the_last_sentence_end(process_controller):
+    text = "one two three four five six. seven eight nine ten eleven twelve thirteen fourteen."
+    chunks = split(process_controller, text, chunk_size=8, boundary="sentence")
+
+    assert chunks[0] == ["one", "two", "three", "four", "five", "six."]
+    assert chunks[1][0] == "seven"
+
+
+def test_sentence_end_in_first_half_of_the_window_is_ignored(process_controller):
+    text = "one two. three four five six seven eight nine ten"
+    chunks = split(process_controller, text, chunk_size=8, boundary="sentence")
+
+    assert len(chunks[0]) == 8
+
+
+def test_paragraph_boundary_is_preferred_over_a_later_sentence_end(process_controller):
+    text = "a b c d e.\n\nf g h. i j k"
+
+    paragraph_chunks = split(process_controller, text, chunk_size=10, boundary="paragraph")
+    sentence_chunks = split(process_controller, text, chunk_size=10, boundary="sentence")
+
+    assert paragraph_chunks[0] == ["a", "b", "c", "d", "e."]
+    assert sentence_chunks[0] == ["a", "b", "c", "d", "e.", "f", "g", "h."]
+
+
+def test_last_partial_window_is_emitted(process_controller):
+    text_words = words(23)
+    chunks = split(process_controller, " ".join(text_words), chunk_size=10, overlap_size=2)
+
+    assert len(chunks) == 3
+    assert chunks[-1] == text_words[16:]
+
+
+def test_tail_made_only_of_overlap_is_not_emitted_again(process_controller):
+    text_words = words(18)
+    chunks = split(process_controller, " ".join(text_words), chunk_size=10, overlap_size=2)
+
+    assert chunks == [text_words[:10], text_words[8:]]
+
+
+def test_find_chunk_boundary_without_boundary_takes_the_full_window(process_controller):
+    window = [(f"w{i}.", {}, True, False) for i in range(6)]
+
+    assert process_controller.find_chunk_boundary(window, min_cut=3, boundary="none") == 6
@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram,generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram,generate_latest, CONTENT_TYPE_LATEST
 from fastapi import Response,FastAPI, Request
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
@@ -8,6 +8,61 @@ import time
 REQUEST_COUNT = Counter('http_requests_total', 'Total HTTP Requests', ['method', 'endpoint', 'status'])
 REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'HTTP Request Latency', ['method', 'endpoint'])
 
+# Embedding scheduler
+EMBEDDING_QUEUE_DEPTH = Gauge('embedding_queue_depth', 'Texts waiting for an embedding request', ['provider'])
+EMBEDDING_REQUESTS = Counter('embedding_requests_total', 'Embedding requests sent to the provider', ['provider', 'status'])
+EMBEDDING_TEXTS = Counter('embedding_texts_total', 'Texts embedded by the provider', ['provider'])
+EMBEDDING_TOKENS = Counter('embedding_tokens_total', 'Estimated tokens embedded by the provider', ['provider'])
+EMBEDDING_LATENCY = Histogram('embedding_request_duration_seconds', 'Embedding request latency', ['provider'])
+EMBEDDING_BATCH_TOKENS = Gauge('embedding_batch_tokens', 'Current adaptive token budget per embedding request', ['provider'])
+
+# Ingestion stages: extract, chunk, store, embed, vector_insert, index_build.
+# rate(ingest_stage_items_total) gives the per-stage throughput (pages or chunks/sec).
+INGEST_STAGE_LATENCY = Histogram('ingest_stage_duration_seconds', 'Time spent in one ingestion stage step', ['stage', 'project', 'provider'])
+INGEST_STAGE_ITEMS = Counter('ingest_stage_items_total', 'Items (pages or chunks) passed through an ingestion stage', ['stage', 'project', 'provider'])
+INGEST_EMBEDDING_BATCH_SIZE = Histogram('ingest_embedding_batch_size', 'Chunks per embedding batch during ingestion', ['project', 'provider'], buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000))
+# observed by the provider on every build: threshold, bulk load, re-index or re-cluster
+INDEX_BUILD_LATENCY = Histogram('vector_index_build_duration_seconds', 'Vector index build duration', ['collection', 'index_type'], buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800))
+
+
+def observe_ingest_stage(stage: str, project_id, provider: str, started_at: float, items: int = 0):
+    """Record one step of an ingestion stage that started at time.monotonic() started_at."""
+    labels = {'stage': stage, 'project': str(project_id), 'provider': provider}
+    INGEST_STAGE_LATENCY.labels(**labels).observe(time.monotonic() - started_at)
+    if items:
+        INGEST_STAGE_ITEMS.labels(**labels).inc(items)
+
+
+class TimedIterator:
+    """Wraps a lazy iterator and records each produced item as an ingestion stage step.
+
+    Lazy stages pull from each other (the chunker pulls pages from the loader),
+    so time spent inside an `inner` TimedIterator is subtracted rather than
+    counted twice.
+    """
+
+    def __init__(self, iterator, stage: str, project_id, provider: str = 'local', inner=None):
+        self.iterator = iter(iterator)
+        self.labels = {'stage': stage, 'project': str(project_id), 'provider': provider}
+        self.inner = inner
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        inner_seconds = self.inner.seconds if self.inner else 0.0
+        started_at = time.monotonic()
+        item = next(self.iterator)
+        elapsed = time.monotonic() - started_at
+        self.seconds += elapsed
+        if self.inner:
+            elapsed -= self.inner.seconds - inner_seconds
+        INGEST_STAGE_LATENCY.labels(**self.labels).observe(max(elapsed, 0.0))
+        INGEST_STAGE_ITEMS.labels(**self.labels).inc()
+        return item
+
+
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()